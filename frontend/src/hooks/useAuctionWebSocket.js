@@ -4,6 +4,8 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { API_BASE_URL } from '../services/api';
 
+const textDecoder = new TextDecoder();
+
 export function useAuctionWebSocket(auctionId, token) {
     const [connected, setConnected] = useState(false);
     const [auctionState, setAuctionState] = useState(null);
@@ -26,6 +28,8 @@ export function useAuctionWebSocket(auctionId, token) {
 
         try {
             const ws = new WebSocket(wsUrl);
+            // The server sends UTF-8 JSON in binary frames
+            ws.binaryType = 'arraybuffer';
             wsRef.current = ws;
 
             ws.onopen = () => {
@@ -37,8 +41,10 @@ export function useAuctionWebSocket(auctionId, token) {
 
             ws.onmessage = (event) => {
                 try {
-                    const message = JSON.parse(event.data);
-                    handleMessage(message);
+                    // The server may batch several messages into one array frame
+                    const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+                    const data = JSON.parse(text);
+                    (Array.isArray(data) ? data : [data]).forEach(handleMessage);
                 } catch (err) {
                     console.error('Failed to parse WebSocket message:', err);
                 }
@@ -93,6 +99,12 @@ export function useAuctionWebSocket(auctionId, token) {
                 ]);
                 break;
 
+            case 'bid_and_state':
+                // Bids since the last state broadcast, followed by the new state
+                message.bids.forEach(handleMessage);
+                handleMessage(message.state);
+                break;
+
             case 'player:sold':
                 // Could trigger a celebration animation
                 console.log('Player sold:', message);
@@ -4,19 +4,30 @@ Main entry point for the Cricket Data API application.
 This file serves as the production entry point for web servers.
 """
 import os
-import sys
-from pathlib import Path
-
-# Add the src directory to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
 # Import the FastAPI application from app.py (modular routers)
+# app.py puts src/ on the Python path for its top-level imports
 from src.app import app
+from uvicorn.workers import UvicornWorker
+
+# Server settings shared by Gunicorn workers and direct runs: uvloop (picked by
+# "auto" when installed), httptools, and the websockets protocol implementation
+# with a 256 KiB frame cap (auction messages are small JSON objects)
+UVICORN_KWARGS = {
+    "loop": "auto",
+    "http": "auto",
+    "ws": "websockets",
+    "ws_max_size": 256 * 1024,
+}
+
+
+class AuctionUvicornWorker(UvicornWorker):
+    """Gunicorn worker class: gunicorn -k main.AuctionUvicornWorker main:app"""
+    CONFIG_KWARGS = UVICORN_KWARGS
 
 # This code is used when running with Gunicorn
 if __name__ == "__main__":
@@ -25,4 +36,4 @@ if __name__ == "__main__":
     port = int(os.getenv("API_PORT", 8000))
     
     print(f"Starting Shroff Premier League API server on {host}:{port}...")
-    uvicorn.run("main:app", host=host, port=port, reload=False)
+    uvicorn.run("main:app", host=host, port=port, reload=False, **UVICORN_KWARGS)
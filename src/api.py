@@ -1,28 +1,28 @@
 # src/api.py
 import os
-import sys
-from typing import List, Optional
-from decimal import Decimal # Import Decimal
-
-from fastapi import Depends, FastAPI, HTTPException, Body
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import func, case, and_ # Import func, case, and_
-from pydantic import BaseModel, Field
+import hashlib
+import logging
+from itertools import groupby
+from typing import List, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, FastAPI, HTTPException, Body, Request, Response
+from sqlalchemy.orm import Session, contains_eager, aliased
+from sqlalchemy import (
+    func, case, cast, and_, or_, exists, select, insert, update, lambda_stmt, Integer, Float
+)
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
-# Add src directory to Python path if needed
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
-
-try:
-    # Ensure all relevant models are imported
-    from database import (
-        SessionLocal, Player, Shroff_teams, TeamPlayer,
-        MatchStats, Match, PlayerTransfer, get_db, engine # Added PlayerTransfer
-    )
-except ImportError as e:
-    print(f"Error importing database modules: {e}")
-    print("Ensure database.py is in the src directory and contains all models.")
-    sys.exit(1)
+
+# src/ is put on the path by the entry point (main.py / app.py / running from src)
+from database import (
+    SessionLocal, Player, Shroff_teams, TeamPlayer,
+    MatchStats, Match, PlayerTransfer, PlayerMatchTotals, get_db, get_readonly_db, engine # Added PlayerTransfer
+)
+from log_config import setup_logging, shutdown_logging
+
+logger = logging.getLogger(__name__)
 
 # --- Pydantic Models ---
 
@@ -32,8 +32,8 @@ class PlayerBase(BaseModel):
     player_name: str
     team: Optional[str] = None # IPL team
 
-    class Config:
-        from_attributes = True
+    # Response models are never mutated after construction
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
 
 class TeamPlayerInfo(BaseModel):
     player: PlayerBase
@@ -41,8 +41,7 @@ class TeamPlayerInfo(BaseModel):
     is_captain: bool
     is_vice_captain: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
 
 class ShroffTeamDetails(BaseModel):
     id: int
@@ -51,8 +50,7 @@ class ShroffTeamDetails(BaseModel):
     purse_remaining: float
     players: List[TeamPlayerInfo]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
 
 class UnsoldPlayer(PlayerBase):
     pass
@@ -76,6 +74,27 @@ class TeamStatsResponse(BaseModel):
     team_code: str
     player_aggregated_stats: List[TeamPlayerAggregatedStats]
 
+# Serializers for the list responses returned directly as ORJSONResponse
+_UNSOLD_PLAYER_LIST_ADAPTER = TypeAdapter(List[UnsoldPlayer])
+_TEAM_STATS_ADAPTER = TypeAdapter(TeamStatsResponse)
+
+class _TeamPlayerInfoRaw(NamedTuple):
+    """Plain tuple row built in the /teams/ loop; serialized in the TeamPlayerInfo shape."""
+    player_id: int
+    player_name: str
+    team: Optional[str]
+    bought_for: float
+    is_captain: bool
+    is_vice_captain: bool
+
+    def to_json(self) -> dict:
+        return {
+            "player": {"id": self.player_id, "player_name": self.player_name, "team": self.team},
+            "bought_for": self.bought_for,
+            "is_captain": self.is_captain,
+            "is_vice_captain": self.is_vice_captain
+        }
+
 # --- New Models for Management API ---
 
 class TradeRequest(BaseModel):
@@ -103,7 +122,7 @@ class ActionResponse(BaseModel):
 
 
 # --- FastAPI App ---
-app = FastAPI(title="Shroff Premier League API", version="1.1.0") # Updated version
+app = FastAPI(title="Shroff Premier League API", version="1.1.0", default_response_class=ORJSONResponse) # Updated version
 
 # --- CORS Middleware ---
 origins = ["*"]
@@ -115,95 +134,203 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("startup")
+def start_logging():
+    setup_logging()
+
+
+@app.on_event("shutdown")
+def stop_logging():
+    shutdown_logging()
+
 # --- Helper Functions (Existing + New) ---
 
-def get_current_player_ids(db: Session) -> set:
-    """Returns a set of player IDs currently active on any Shroff team."""
-    assigned_player_ids_query = db.query(TeamPlayer.player_id).filter(
-        TeamPlayer.left_at_match == None
-    ).distinct()
-    return {pid for (pid,) in assigned_player_ids_query.all()}
+# Purses are plain floats; rounding strips binary noise (0.1 + 0.2) but keeps half-unit refunds exact
+_PURSE_DECIMALS = 6
+
+def _round_purse(amount: float) -> float:
+    return round(amount, _PURSE_DECIMALS)
+
+def _roster_fingerprint(db: Session) -> tuple:
+    # Cheap aggregate lookups that change when the daily cron adds players, roster rows or purses
+    return db.query(
+        select(func.max(TeamPlayer.id)).scalar_subquery(),
+        select(func.max(TeamPlayer.updated_at)).scalar_subquery(),
+        select(func.max(Shroff_teams.updated_at)).scalar_subquery(),
+        select(func.max(Player.id)).scalar_subquery()
+    ).one()
+
+def _etag(key: str, *extra) -> str:
+    # Derived from the data alone, so every worker serves the same ETag for the same rosters
+    raw = ":".join(str(part) for part in (key, *extra))
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=8).hexdigest() + '"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match may list several tags, weak (W/"...") or strong, or be *
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+def _get_team(db: Session, team_id: int, for_update: bool = False) -> Optional[Shroff_teams]:
+    """Loads a Shroff team by id; the lambda statement's compiled SQL is cached across requests."""
+    stmt = lambda_stmt(lambda: select(Shroff_teams).where(Shroff_teams.id == team_id))
+    if for_update:
+        stmt += lambda s: s.with_for_update()
+    return db.execute(stmt).scalars().first()
+
+# --- Team player stats aggregation ---
+_INT_STAT_FIELDS = (
+    "matches_for_team", "total_runs", "total_wickets",
+    "total_catches", "total_stumpings", "total_run_outs"
+)
+_FLOAT_STAT_FIELDS = (
+    "total_points", "total_batting_points", "total_bowling_points", "total_fielding_points"
+)
+# Points multiplier based on captain status, built once and shared by the stats queries
+_CAPTAIN_MULT = case(
+    (TeamPlayer.is_captain == True, 2.0),
+    (TeamPlayer.is_vice_captain == True, 1.5),
+    else_=1.0
+)
+
+# Tenure totals are read from the running totals in player_match_totals:
+# the last row before left_at_match minus the last row before joined_at_match
+# (if player left, only matches strictly BEFORE leaving match id)
+_TENURE_UPPER = aliased(PlayerMatchTotals)
+_TENURE_LOWER = aliased(PlayerMatchTotals)
+_LAST_MATCH_IN_TENURE = select(func.max(PlayerMatchTotals.match_id)).where(
+    PlayerMatchTotals.player_id == TeamPlayer.player_id,
+    PlayerMatchTotals.match_id >= TeamPlayer.joined_at_match,
+    or_(TeamPlayer.left_at_match == None, PlayerMatchTotals.match_id < TeamPlayer.left_at_match)
+).correlate(TeamPlayer).scalar_subquery()
+_LAST_MATCH_BEFORE_JOINING = select(func.max(PlayerMatchTotals.match_id)).where(
+    PlayerMatchTotals.player_id == TeamPlayer.player_id,
+    PlayerMatchTotals.match_id < TeamPlayer.joined_at_match
+).correlate(TeamPlayer).scalar_subquery()
+
+
+def _tenure_total(column, type_=Integer):
+    # NULLs are folded to 0 and point totals cast to float in SQL, so rows need no None handling
+    total = func.coalesce(getattr(_TENURE_UPPER, column), 0) - func.coalesce(getattr(_TENURE_LOWER, column), 0)
+    return cast(total, type_)
+
+
+def _join_tenure_totals(query):
+    """Joins TeamPlayer rows in the query to the running totals bounding each tenure."""
+    return query.join(
+        # Players with no matches in their tenure have no upper row and are left out
+        _TENURE_UPPER, and_(
+            _TENURE_UPPER.player_id == TeamPlayer.player_id,
+            _TENURE_UPPER.match_id == _LAST_MATCH_IN_TENURE
+        )
+    ).outerjoin(
+        _TENURE_LOWER, and_(
+            _TENURE_LOWER.player_id == TeamPlayer.player_id,
+            _TENURE_LOWER.match_id == _LAST_MATCH_BEFORE_JOINING
+        )
+    )
+
+
+_ZERO_AGGREGATED_STATS = {
+    **{field: 0 for field in _INT_STAT_FIELDS},
+    **{field: 0.0 for field in _FLOAT_STAT_FIELDS}
+}
+
+def _fast_player(player, model=PlayerBase):
+    # Loaded DB columns are trusted, so validation is skipped
+    return model.model_construct(id=player.id, player_name=player.player_name, team=player.team)
+
+def aggregate_team_player_stats(db: Session, team_players: List[TeamPlayer]) -> dict:
+    """
+    Aggregates stats for several TeamPlayer tenures in a single query over the
+    precomputed player_match_totals. Each player's tenure bounds are applied per row and
+    the captain/vice-captain multiplier is returned alongside the raw point totals.
+    Returns the aggregated rows keyed by TeamPlayer.id.
+    """
+    # Players who joined after the latest recorded match cannot have stats yet
+    # (common right after an auction), so they skip the aggregation entirely
+    latest_match_id = db.query(func.max(Match.id)).scalar()
+    if latest_match_id is None:
+        return {}
+    team_player_ids = [
+        tp.id for tp in team_players
+        if tp.joined_at_match is not None and tp.joined_at_match <= latest_match_id
+    ]
+    if not team_player_ids:
+        return {}
+
+    stats_query = _join_tenure_totals(db.query(
+        TeamPlayer.id.label("team_player_id"),
+        _tenure_total("matches").label("matches_for_team"),
+        _tenure_total("runs").label("total_runs"),
+        _tenure_total("wickets").label("total_wickets"),
+        _tenure_total("catches").label("total_catches"),
+        _tenure_total("stumpings").label("total_stumpings"),
+        _tenure_total("run_outs").label("total_run_outs"),
+        # Raw point totals; the captain/vice-captain factor is applied once after aggregation
+        _tenure_total("total_points", Float).label("total_points"),
+        _tenure_total("batting_points", Float).label("total_batting_points"),
+        _tenure_total("bowling_points", Float).label("total_bowling_points"),
+        _tenure_total("fielding_points", Float).label("total_fielding_points"),
+        _CAPTAIN_MULT.label("multiplier")
+    ).select_from(TeamPlayer)).filter(
+        TeamPlayer.id.in_(team_player_ids)
+    )
+
+    stats_rows = stats_query.execution_options(stream_results=True).yield_per(200)
+    return {row.team_player_id: row for row in stats_rows}
 
-# --- calculate_player_stats_for_team (Keep existing) ---
-def calculate_player_stats_for_team(db: Session, team_player: TeamPlayer) -> Optional[TeamPlayerAggregatedStats]:
+
+def calculate_player_stats_for_team(team_player: TeamPlayer, aggregated_stats) -> Optional[TeamPlayerAggregatedStats]:
     """
-    Calculates aggregated stats for a player during their tenure with a specific team.
-    Takes into account captain/vice-captain multipliers for points.
+    Builds the aggregated stats for a player during their tenure with a specific team
+    from a row returned by aggregate_team_player_stats (None if no matches were found).
     """
     if not team_player.player:
-        print(f"Warning: TeamPlayer {team_player.id} has no associated Player.")
+        logger.warning("TeamPlayer %s has no associated Player", team_player.id)
         return None
 
-    # Get the multiplier based on captain status
-    multiplier = 2.0 if team_player.is_captain else (1.5 if team_player.is_vice_captain else 1.0)
-    
-    # Base query for MatchStats joined with Match
-    stats_query = db.query(
-        func.count(MatchStats.id).label("matches_for_team"),
-        func.sum(MatchStats.runs).label("total_runs"),
-        func.sum(MatchStats.wickets).label("total_wickets"),
-        func.sum(MatchStats.catches).label("total_catches"),
-        func.sum(MatchStats.stumpings).label("total_stumpings"),
-        func.sum(MatchStats.run_outs).label("total_run_outs"),
-        # Multiply points by the appropriate factor for captain/vice-captain
-        func.sum(MatchStats.total_points * multiplier).label("total_points"),
-        func.sum(MatchStats.batting_points * multiplier).label("total_batting_points"),
-        func.sum(MatchStats.bowling_points * multiplier).label("total_bowling_points"),
-        func.sum(MatchStats.fielding_points * multiplier).label("total_fielding_points")
-    ).join(Match).filter(MatchStats.player_id == team_player.player_id)
-
-    # Filter stats based on player's tenure in the team
-    stats_query = stats_query.filter(Match.id >= team_player.joined_at_match)
-    if team_player.left_at_match is not None:
-        # If player left, only include matches strictly BEFORE leaving match id
-        stats_query = stats_query.filter(Match.id < team_player.left_at_match)
-
-    aggregated_stats = stats_query.first()
-
     # Handle case where player played 0 matches for the team in the recorded stats
     if not aggregated_stats or aggregated_stats.matches_for_team == 0:
-         return TeamPlayerAggregatedStats(
-            player=PlayerBase.model_validate(team_player.player),
-            matches_for_team=0,
-            total_runs=0,
-            total_wickets=0,
-            total_catches=0,
-            total_stumpings=0,
-            total_run_outs=0,
-            total_points=0.0,
-            total_batting_points=0.0,
-            total_bowling_points=0.0,
-            total_fielding_points=0.0
+        return TeamPlayerAggregatedStats.model_construct(
+            player=_fast_player(team_player.player),
+            **_ZERO_AGGREGATED_STATS
         )
 
-    # Helper function to safely convert values
-    def safe_convert(value, target_type):
-        if value is None:
-            return target_type(0)
-        try:
-            # Convert Decimal to float if needed
-            if isinstance(value, Decimal) and target_type is float:
-                return float(value)
-            return target_type(value)
-        except (TypeError, ValueError):
-            print(f"Warning: Could not convert {value} to {target_type}. Using 0.")
-            return target_type(0)
-
-    return TeamPlayerAggregatedStats(
-        player=PlayerBase.model_validate(team_player.player),
-        matches_for_team=safe_convert(aggregated_stats.matches_for_team, int),
-        total_runs=safe_convert(aggregated_stats.total_runs, int),
-        total_wickets=safe_convert(aggregated_stats.total_wickets, int),
-        total_catches=safe_convert(aggregated_stats.total_catches, int),
-        total_stumpings=safe_convert(aggregated_stats.total_stumpings, int),
-        total_run_outs=safe_convert(aggregated_stats.total_run_outs, int),
-        total_points=safe_convert(aggregated_stats.total_points, float),
-        total_batting_points=safe_convert(aggregated_stats.total_batting_points, float),
-        total_bowling_points=safe_convert(aggregated_stats.total_bowling_points, float),
-        total_fielding_points=safe_convert(aggregated_stats.total_fielding_points, float)
+    # Totals arrive COALESCEd and typed from SQL; point totals are scaled by the
+    # captain/vice-captain multiplier here
+    row = aggregated_stats._mapping
+    multiplier = float(row["multiplier"])
+    stats = {field: int(row[field]) for field in _INT_STAT_FIELDS}
+    stats.update({field: float(row[field]) * multiplier for field in _FLOAT_STAT_FIELDS})
+
+    return TeamPlayerAggregatedStats.model_construct(
+        player=_fast_player(team_player.player),
+        **stats
     )
 
 
+def _lock_active_team_player(db: Session, team_id: int, player_id: int):
+    """
+    Returns (player row with id and player_name, active TeamPlayer row on team_id) from one query,
+    locking the TeamPlayer row. If the player is not active on the team, returns (player row or None, None).
+    """
+    row = db.query(Player.id, Player.player_name, TeamPlayer).join(
+        TeamPlayer, and_(
+            TeamPlayer.player_id == Player.id,
+            TeamPlayer.team_id == team_id,
+            TeamPlayer.left_at_match == None
+        )
+    ).filter(Player.id == player_id).with_for_update(of=TeamPlayer).first()
+    if row:
+        return row, row.TeamPlayer
+    # Only reached on the error path, to tell a missing player from an inactive one
+    return db.query(Player.id, Player.player_name).filter(Player.id == player_id).first(), None
+
+
 # --- API Endpoints (Existing + New) ---
 
 @app.get("/")
@@ -212,82 +339,108 @@ async def root():
 
 # --- /teams/ (GET) - Keep Existing ---
 @app.get("/teams/", response_model=List[ShroffTeamDetails])
-async def get_all_shroff_teams(db: Session = Depends(get_db)):
+def get_all_shroff_teams(request: Request, db: Session = Depends(get_readonly_db)):
     # ... (previous implementation remains unchanged) ...
     try:
-        teams = db.query(Shroff_teams).options(
-            selectinload(Shroff_teams.players).selectinload(TeamPlayer.player) # Use selectinload
-        ).all()
+        etag = _etag("teams", *_roster_fingerprint(db))
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Only current roster rows are joined and loaded into Shroff_teams.players
+        teams = db.query(Shroff_teams).outerjoin(
+            TeamPlayer, and_(TeamPlayer.team_id == Shroff_teams.id, TeamPlayer.left_at_match == None)
+        ).outerjoin(
+            Player, Player.id == TeamPlayer.player_id
+        ).options(
+            contains_eager(Shroff_teams.players).contains_eager(TeamPlayer.player)
+        ).order_by(Shroff_teams.id, TeamPlayer.id).populate_existing().all()
         result = []
         for team in teams:
             player_details = []
             for tp in team.players:
-                if tp.left_at_match is None and tp.player:
-                    player_info = PlayerBase.model_validate(tp.player)
-                    team_player_info = TeamPlayerInfo(
-                        player=player_info, bought_for=tp.bought_for,
-                        is_captain=tp.is_captain, is_vice_captain=tp.is_vice_captain
-                    )
-                    player_details.append(team_player_info)
-                elif tp.left_at_match is None and not tp.player:
-                     print(f"Warning: TeamPlayer record {tp.id} is missing related Player {tp.player_id}")
-            team_details = ShroffTeamDetails(
-                id=team.id, team_name=team.team_name, team_code=team.team_code,
-                purse_remaining=team.purse, players=player_details
-            )
-            result.append(team_details)
-        return result
+                if tp.player:
+                    player = tp.player
+                    player_details.append(_TeamPlayerInfoRaw(
+                        player.id, player.player_name, player.team,
+                        tp.bought_for, tp.is_captain, tp.is_vice_captain
+                    ))
+                else:
+                     logger.warning("TeamPlayer record %s is missing related Player %s", tp.id, tp.player_id)
+            # Same shape as ShroffTeamDetails, serialized once at the boundary
+            result.append({
+                "id": team.id, "team_name": team.team_name, "team_code": team.team_code,
+                "purse_remaining": team.purse, "players": [info.to_json() for info in player_details]
+            })
+        # Trusted DB rows, so skip FastAPI's response_model pass
+        return ORJSONResponse(result, headers={"ETag": etag})
     except Exception as e:
-        print(f"Error fetching teams: {e}")
+        logger.exception("Error fetching teams")
         raise HTTPException(status_code=500, detail="Internal Server Error retrieving team data")
 
 
 # --- /players/unsold/ (GET) - Keep Existing ---
 @app.get("/players/unsold/", response_model=List[UnsoldPlayer])
-async def get_unsold_players(db: Session = Depends(get_db)):
+def get_unsold_players(request: Request, db: Session = Depends(get_readonly_db)):
     # ... (previous implementation remains unchanged) ...
      try:
-        assigned_player_ids = get_current_player_ids(db)
-        unsold_players_query = db.query(Player).filter(Player.id.notin_(assigned_player_ids))
-        unsold_players = unsold_players_query.all()
-        return [UnsoldPlayer.model_validate(player) for player in unsold_players]
+        etag = _etag("unsold", *_roster_fingerprint(db))
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Anti-join: players with no active TeamPlayer record on any team
+        # Only the columns exposed by UnsoldPlayer are fetched (no ORM identity map)
+        unsold_players_stmt = lambda_stmt(lambda: select(Player.id, Player.player_name, Player.team).where(~exists().where(and_(
+            TeamPlayer.player_id == Player.id,
+            TeamPlayer.left_at_match == None
+        ))))
+        # Rows are streamed from the cursor; trusted columns skip validation
+        unsold_rows = db.execute(unsold_players_stmt, execution_options={"stream_results": True, "yield_per": 200})
+        unsold_players = [_fast_player(row, UnsoldPlayer) for row in unsold_rows]
+        return ORJSONResponse(_UNSOLD_PLAYER_LIST_ADAPTER.dump_python(unsold_players, mode="json"), headers={"ETag": etag})
      except Exception as e:
-        print(f"Error fetching unsold players: {e}")
+        logger.exception("Error fetching unsold players")
         raise HTTPException(status_code=500, detail="Internal Server Error retrieving unsold player data")
 
 # --- /teams/{team_id}/player_stats/ (GET) - Keep Existing ---
 @app.get("/teams/{team_id}/player_stats/", response_model=TeamStatsResponse)
-async def get_team_player_stats(team_id: int, db: Session = Depends(get_db)):
+def get_team_player_stats(team_id: int, db: Session = Depends(get_readonly_db)):
     # ... (previous implementation remains unchanged) ...
     try:
-        team = db.query(Shroff_teams).options(
-             selectinload(Shroff_teams.players).selectinload(TeamPlayer.player) # Use selectinload
-        ).filter(Shroff_teams.id == team_id).first()
+        team = _get_team(db, team_id)
         if not team:
             raise HTTPException(status_code=404, detail=f"Shroff Team with ID {team_id} not found")
 
+        # Only current players, with their Player rows loaded by the same query
+        current_players = db.query(TeamPlayer).outerjoin(
+            Player, Player.id == TeamPlayer.player_id
+        ).options(
+            contains_eager(TeamPlayer.player)
+        ).filter(
+            TeamPlayer.team_id == team_id, TeamPlayer.left_at_match == None
+        ).order_by(TeamPlayer.id).all()
+        stats_by_team_player = aggregate_team_player_stats(db, current_players)
+
         aggregated_stats_list = []
-        for tp in team.players:
-            if tp.left_at_match is None: # Only current players
-                player_stats = calculate_player_stats_for_team(db, tp)
-                if player_stats:
-                    aggregated_stats_list.append(player_stats)
+        for tp in current_players:
+            player_stats = calculate_player_stats_for_team(tp, stats_by_team_player.get(tp.id))
+            if player_stats:
+                aggregated_stats_list.append(player_stats)
 
-        return TeamStatsResponse(
+        response = TeamStatsResponse.model_construct(
             team_id=team.id, team_name=team.team_name, team_code=team.team_code,
             player_aggregated_stats=aggregated_stats_list
         )
+        return ORJSONResponse(_TEAM_STATS_ADAPTER.dump_python(response, mode="json"))
     except HTTPException as http_exc: raise http_exc
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error retrieving team player stats")
         raise HTTPException(status_code=500, detail="Internal Server Error retrieving team player stats")
 
 
 # --- New Management Endpoints ---
 
 @app.post("/trades/", response_model=ActionResponse)
-async def execute_trade(trade_data: TradeRequest, db: Session = Depends(get_db)):
+def execute_trade(trade_data: TradeRequest, db: Session = Depends(get_db)):
     """
     Executes a player trade between two Shroff teams.
     """
@@ -298,60 +451,55 @@ async def execute_trade(trade_data: TradeRequest, db: Session = Depends(get_db))
         # Use a transaction
         with db.begin_nested(): # Use nested transaction or manage manually
             # --- Validation ---
-            from_team = db.query(Shroff_teams).filter(Shroff_teams.id == trade_data.from_team_id).with_for_update().first()
-            to_team = db.query(Shroff_teams).filter(Shroff_teams.id == trade_data.to_team_id).with_for_update().first()
-            player = db.query(Player).filter(Player.id == trade_data.player_id).first()
+            # Both teams are locked by one query
+            teams = {team.id: team for team in db.query(Shroff_teams).filter(
+                Shroff_teams.id.in_([trade_data.from_team_id, trade_data.to_team_id])
+            ).with_for_update().all()}
+            from_team = teams.get(trade_data.from_team_id)
+            to_team = teams.get(trade_data.to_team_id)
 
             if not from_team or not to_team:
                 raise HTTPException(status_code=404, detail="One or both teams not found.")
-            if not player:
-                raise HTTPException(status_code=404, detail="Player not found.")
 
-            # Find the player's current active record in the from_team
-            current_team_player = db.query(TeamPlayer).filter(
-                TeamPlayer.team_id == trade_data.from_team_id,
-                TeamPlayer.player_id == trade_data.player_id,
-                TeamPlayer.left_at_match == None
-            ).with_for_update().first()
+            # The player and their current active record in the from_team
+            player, current_team_player = _lock_active_team_player(db, trade_data.from_team_id, trade_data.player_id)
 
+            if not player:
+                raise HTTPException(status_code=404, detail="Player not found.")
             if not current_team_player:
                 raise HTTPException(status_code=400, detail=f"Player {player.player_name} is not currently active in team {from_team.team_name}.")
 
             # Check purse if fee > 0
-            if trade_data.transfer_fee > 0 and Decimal(str(to_team.purse)) < Decimal(str(trade_data.transfer_fee)):
+            if trade_data.transfer_fee > 0 and to_team.purse < trade_data.transfer_fee:
                  raise HTTPException(status_code=400, detail=f"{to_team.team_name} has insufficient purse ({to_team.purse}) for transfer fee ({trade_data.transfer_fee}).")
 
             # --- Execution ---
             # Mark player as left from the original team
             current_team_player.left_at_match = trade_data.match_id
 
-            # Add player to the new team
-            new_team_player = TeamPlayer(
+            # Add player to the new team (plain INSERTs; nothing reads the new rows back)
+            db.execute(insert(TeamPlayer), [dict(
                 team_id=trade_data.to_team_id,
                 player_id=trade_data.player_id,
                 joined_at_match=trade_data.match_id, # Joins after this match
                 bought_for=trade_data.transfer_fee, # Cost for the new team is the fee
                 is_captain=False, # Reset captain status on trade
                 is_vice_captain=False
-            )
-            db.add(new_team_player)
+            )])
 
-            # Update purses (using Decimal for precision)
-            from_team.purse = float(Decimal(str(from_team.purse)) + Decimal(str(trade_data.transfer_fee)))
-            to_team.purse = float(Decimal(str(to_team.purse)) - Decimal(str(trade_data.transfer_fee)))
+            # Update purses
+            from_team.purse = _round_purse(from_team.purse + trade_data.transfer_fee)
+            to_team.purse = _round_purse(to_team.purse - trade_data.transfer_fee)
 
             # Create PlayerTransfer record
-            transfer_record = PlayerTransfer(
+            db.execute(insert(PlayerTransfer), [dict(
                 player_id=trade_data.player_id,
                 from_team_id=trade_data.from_team_id,
                 to_team_id=trade_data.to_team_id,
                 transfer_amount=trade_data.transfer_fee,
                 transfer_type="trade",
                 transfer_at_match=trade_data.match_id
-            )
-            db.add(transfer_record)
-
-            db.flush() # Ensure IDs are generated if needed
+            )])
 
         db.commit() # Commit the transaction
 
@@ -374,14 +522,12 @@ async def execute_trade(trade_data: TradeRequest, db: Session = Depends(get_db))
         raise http_exc
     except Exception as e:
         db.rollback()
-        print(f"Error during trade: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error during trade")
         raise HTTPException(status_code=500, detail="Internal Server Error during trade.")
 
 
 @app.post("/teams/{team_id}/release_player/", response_model=ActionResponse)
-async def release_player(team_id: int, release_data: ReleaseRequest, db: Session = Depends(get_db)):
+def release_player(team_id: int, release_data: ReleaseRequest, db: Session = Depends(get_db)):
     """
     Releases a player from a Shroff team, making them available and refunding 50% cost.
     """
@@ -391,21 +537,16 @@ async def release_player(team_id: int, release_data: ReleaseRequest, db: Session
     try:
         with db.begin_nested():
             # --- Validation ---
-            team = db.query(Shroff_teams).filter(Shroff_teams.id == team_id).with_for_update().first()
-            player = db.query(Player).filter(Player.id == release_data.player_id).first()
+            team = _get_team(db, team_id, for_update=True)
 
             if not team:
                 raise HTTPException(status_code=404, detail="Team not found.")
-            if not player:
-                raise HTTPException(status_code=404, detail="Player not found.")
 
-            # Find the player's current active record in the team
-            current_team_player = db.query(TeamPlayer).filter(
-                TeamPlayer.team_id == team_id,
-                TeamPlayer.player_id == release_data.player_id,
-                TeamPlayer.left_at_match == None
-            ).with_for_update().first()
+            # The player and their current active record in the team
+            player, current_team_player = _lock_active_team_player(db, team_id, release_data.player_id)
 
+            if not player:
+                raise HTTPException(status_code=404, detail="Player not found.")
             if not current_team_player:
                  raise HTTPException(status_code=400, detail=f"Player {player.player_name} is not currently active in team {team.team_name}.")
 
@@ -414,8 +555,8 @@ async def release_player(team_id: int, release_data: ReleaseRequest, db: Session
             current_team_player.left_at_match = release_data.match_id
 
             # Calculate and add refund (50% of bought_for price)
-            refund_amount = Decimal(str(current_team_player.bought_for)) * Decimal('0.5')
-            team.purse = float(Decimal(str(team.purse)) + refund_amount)
+            refund_amount = current_team_player.bought_for * 0.5
+            team.purse = _round_purse(team.purse + refund_amount)
 
             # No PlayerTransfer record for release refund
 
@@ -440,14 +581,12 @@ async def release_player(team_id: int, release_data: ReleaseRequest, db: Session
         raise http_exc
     except Exception as e:
         db.rollback()
-        print(f"Error during release: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error during release")
         raise HTTPException(status_code=500, detail="Internal Server Error during release.")
 
 
 @app.post("/teams/{team_id}/buy_player/", response_model=ActionResponse)
-async def buy_player(team_id: int, buy_data: BuyRequest, db: Session = Depends(get_db)):
+def buy_player(team_id: int, buy_data: BuyRequest, db: Session = Depends(get_db)):
     """
     Buys an available (unsold or released) player for a Shroff team.
     """
@@ -457,55 +596,55 @@ async def buy_player(team_id: int, buy_data: BuyRequest, db: Session = Depends(g
     try:
         with db.begin_nested():
             # --- Validation ---
-            team = db.query(Shroff_teams).filter(Shroff_teams.id == team_id).with_for_update().first()
-            player = db.query(Player).filter(Player.id == buy_data.player_id).first()
+            team = _get_team(db, team_id, for_update=True)
 
             if not team:
                 raise HTTPException(status_code=404, detail="Team not found.")
+
+            # The player plus, if active on ANY team, only that assignment's id and team name
+            OtherTeam = aliased(Shroff_teams)
+            player = db.query(
+                Player.id, Player.player_name,
+                TeamPlayer.id.label("active_assignment_id"), OtherTeam.team_name.label("other_team_name")
+            ).outerjoin(
+                TeamPlayer, and_(TeamPlayer.player_id == Player.id, TeamPlayer.left_at_match == None)
+            ).outerjoin(
+                OtherTeam, OtherTeam.id == TeamPlayer.team_id
+            ).filter(Player.id == buy_data.player_id).first()
+
             if not player:
                  raise HTTPException(status_code=404, detail="Player not found.")
 
-            # Check if player is currently active on ANY team
-            current_assignments = db.query(TeamPlayer).filter(
-                TeamPlayer.player_id == buy_data.player_id,
-                TeamPlayer.left_at_match == None
-            ).first()
-
-            if current_assignments:
-                 other_team = db.query(Shroff_teams).filter(Shroff_teams.id == current_assignments.team_id).first()
-                 raise HTTPException(status_code=400, detail=f"Player {player.player_name} is currently active in another team ({other_team.team_name if other_team else 'Unknown Team'}). Cannot buy.")
+            if player.active_assignment_id is not None:
+                 raise HTTPException(status_code=400, detail=f"Player {player.player_name} is currently active in another team ({player.other_team_name or 'Unknown Team'}). Cannot buy.")
 
             # Check purse
-            if Decimal(str(team.purse)) < Decimal(str(buy_data.purchase_price)):
+            if team.purse < buy_data.purchase_price:
                  raise HTTPException(status_code=400, detail=f"{team.team_name} has insufficient purse ({team.purse}) to buy player for ({buy_data.purchase_price}).")
 
             # --- Execution ---
-            # Add player to the team
-            new_team_player = TeamPlayer(
+            # Add player to the team (plain INSERTs; nothing reads the new rows back)
+            db.execute(insert(TeamPlayer), [dict(
                 team_id=team_id,
                 player_id=buy_data.player_id,
                 joined_at_match=buy_data.match_id, # Joins after this match
                 bought_for=buy_data.purchase_price, # Cost for the team
                 is_captain=False,
                 is_vice_captain=False
-            )
-            db.add(new_team_player)
+            )])
 
             # Update purse
-            team.purse = float(Decimal(str(team.purse)) - Decimal(str(buy_data.purchase_price)))
+            team.purse = _round_purse(team.purse - buy_data.purchase_price)
 
             # Create PlayerTransfer record
-            transfer_record = PlayerTransfer(
+            db.execute(insert(PlayerTransfer), [dict(
                 player_id=buy_data.player_id,
                 from_team_id=None, # Coming from the 'market' / unsold pool
                 to_team_id=team_id,
                 transfer_amount=buy_data.purchase_price,
                 transfer_type="buy", # Or "mini-auction" if you prefer
                 transfer_at_match=buy_data.match_id
-            )
-            db.add(transfer_record)
-
-            db.flush()
+            )])
 
         db.commit()
 
@@ -526,14 +665,12 @@ async def buy_player(team_id: int, buy_data: BuyRequest, db: Session = Depends(g
         raise http_exc
     except Exception as e:
         db.rollback()
-        print(f"Error during buy: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error during buy")
         raise HTTPException(status_code=500, detail="Internal Server Error during buy.")
 
 
 @app.post("/teams/{team_id}/update_captain/", response_model=ActionResponse)
-async def update_team_captain(
+def update_team_captain(
     team_id: int, 
     captain_data: dict = Body(..., example={
         "player_id": 123,
@@ -567,62 +704,49 @@ async def update_team_captain(
     try:
         with db.begin_nested():
             # Validate team exists
-            team = db.query(Shroff_teams).filter(Shroff_teams.id == team_id).first()
+            team = _get_team(db, team_id)
             if not team:
                 raise HTTPException(status_code=404, detail=f"Team with ID {team_id} not found")
                 
-            # Validate player exists and is on the team
-            player_on_team = db.query(TeamPlayer).filter(
-                TeamPlayer.team_id == team_id,
-                TeamPlayer.player_id == player_id,
-                TeamPlayer.left_at_match == None
-            ).with_for_update().first()
+            # Validate player exists and is on the team (the Player row also gives the name for messages)
+            player, player_on_team = _lock_active_team_player(db, team_id, player_id)
             
             if not player_on_team:
-                player = db.query(Player).filter(Player.id == player_id).first()
                 if player:
                     raise HTTPException(status_code=400, detail=f"Player {player.player_name} is not active on this team")
                 else:
                     raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
             
-            # Get player name for messages
-            player_name = db.query(Player.player_name).filter(Player.id == player_id).scalar()
+            player_name = player.player_name
             
-            # Handle captain status changes
+            # Demotions are single UPDATE statements, without selecting the rows first
             if is_captain:
                 # Remove captain status from any existing captain
-                current_captain = db.query(TeamPlayer).filter(
+                demoted = db.execute(lambda_stmt(lambda: update(TeamPlayer).where(
                     TeamPlayer.team_id == team_id,
                     TeamPlayer.is_captain == True,
                     TeamPlayer.left_at_match == None,
                     TeamPlayer.player_id != player_id  # Don't update the target player yet
-                ).with_for_update().first()
-                
-                if current_captain:
-                    current_captain.is_captain = False
-                    current_captain_name = db.query(Player.player_name).filter(
-                        Player.id == current_captain.player_id).scalar()
-                    print(f"Removed captain status from {current_captain_name}")
+                ).values(is_captain=False)), execution_options={"synchronize_session": False}).rowcount
+                if demoted:
+                    logger.info("Removed captain status from %s player(s) on team %s", demoted, team_id)
             
-            # Handle vice-captain status changes
             if is_vice_captain:
                 # Remove vice-captain status from any existing vice-captain
-                current_vice = db.query(TeamPlayer).filter(
+                demoted = db.execute(lambda_stmt(lambda: update(TeamPlayer).where(
                     TeamPlayer.team_id == team_id,
                     TeamPlayer.is_vice_captain == True,
                     TeamPlayer.left_at_match == None,
                     TeamPlayer.player_id != player_id  # Don't update the target player yet
-                ).with_for_update().first()
-                
-                if current_vice:
-                    current_vice.is_vice_captain = False
-                    current_vice_name = db.query(Player.player_name).filter(
-                        Player.id == current_vice.player_id).scalar()
-                    print(f"Removed vice-captain status from {current_vice_name}")
+                ).values(is_vice_captain=False)), execution_options={"synchronize_session": False}).rowcount
+                if demoted:
+                    logger.info("Removed vice-captain status from %s player(s) on team %s", demoted, team_id)
             
-            # Update the target player
-            player_on_team.is_captain = is_captain
-            player_on_team.is_vice_captain = is_vice_captain
+            # Update the target player by primary key
+            db.query(TeamPlayer).filter(TeamPlayer.id == player_on_team.id).update({
+                TeamPlayer.is_captain: is_captain,
+                TeamPlayer.is_vice_captain: is_vice_captain
+            }, synchronize_session=False)
             
             db.flush()
             
@@ -647,112 +771,139 @@ async def update_team_captain(
         raise http_exc
     except Exception as e:
         db.rollback()
-        print(f"Error updating captain status: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error updating captain status")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+def _team_point_totals(db: Session, team_id: int, player_id: Optional[int] = None) -> Tuple[List[dict], float]:
+    """
+    Per-tenure point totals (multiplier applied) for every player who has scored for the team,
+    aggregated, filtered and sorted highest first in SQL, along with their sum.
+    """
+    points = _tenure_total("total_points", Float) * _CAPTAIN_MULT
+    query = _join_tenure_totals(db.query(
+        TeamPlayer.id.label("team_player_id"),
+        TeamPlayer.player_id,
+        TeamPlayer.is_captain,
+        TeamPlayer.is_vice_captain,
+        Player.player_name,
+        points.label("total_points"),
+        # Team total over the same filtered rows, repeated on each row
+        func.sum(points).over().label("team_total")
+    ).select_from(TeamPlayer)).outerjoin(
+        Player, Player.id == TeamPlayer.player_id
+    ).filter(
+        TeamPlayer.team_id == team_id,
+        # Only include players who scored points
+        points > 0
+    )
+    if player_id is not None:
+        query = query.filter(TeamPlayer.player_id == player_id)
+
+    rows = query.order_by(points.desc(), TeamPlayer.id).all()
+    contributions = [
+        {
+            "team_player_id": row.team_player_id,
+            "player_id": row.player_id,
+            "player_name": row.player_name if row.player_name is not None else f"Unknown Player ({row.player_id})",
+            "is_captain": row.is_captain,
+            "is_vice_captain": row.is_vice_captain,
+            "total_points": row.total_points
+        }
+        for row in rows
+    ]
+    return contributions, (rows[0].team_total if rows else 0.0)
+
+
 @app.get("/teams/{team_id}/total_points/", response_model=dict)
-async def get_team_total_points(team_id: int, db: Session = Depends(get_db)):
+def get_team_total_points(
+    team_id: int,
+    detail: bool = True,
+    player_id: Optional[int] = None,
+    db: Session = Depends(get_readonly_db)
+):
     """
     Calculate the total fantasy points for a team, applying captain/vice-captain multipliers.
     Points are summed only for matches where players were part of the team.
     Captain points are doubled, vice-captain points are multiplied by 1.5.
+    With detail=false the per-match breakdown is omitted, and player_id limits the
+    contributions to a single player.
     """
     try:
         # Verify team exists
-        team = db.query(Shroff_teams).filter(Shroff_teams.id == team_id).first()
+        team = _get_team(db, team_id)
         if not team:
             raise HTTPException(status_code=404, detail=f"Team with ID {team_id} not found")
         
-        # Get all players who have ever been on this team (including past players)
-        team_players = db.query(TeamPlayer).filter(
-            TeamPlayer.team_id == team_id
-        ).all()
-        
-        total_team_points = 0.0
-        player_contributions = []
+        # Contributions come back from SQL already aggregated and sorted (highest first)
+        player_contributions, total_team_points = _team_point_totals(db, team_id, player_id)
+        contributions_by_tenure = {p.pop("team_player_id"): p for p in player_contributions}
         
-        # Process each player's contribution
-        for tp in team_players:
-            # Calculate the correct multiplier based on captain status
-            multiplier = 2.0 if tp.is_captain else (1.5 if tp.is_vice_captain else 1.0)
-            
-            # Query for matches this player played while on the team
-            match_stats_query = db.query(
-                MatchStats, 
+        if detail and player_contributions:
+            # Per-match breakdown, only for the tenures that contributed points
+            match_rows = db.query(
+                TeamPlayer.id.label("team_player_id"),
+                _CAPTAIN_MULT.label("multiplier"),
                 Match.id.label("match_id"),
                 Match.match_name.label("match_name"),
                 MatchStats.total_points.label("base_points")
+            ).select_from(TeamPlayer).join(
+                MatchStats, MatchStats.player_id == TeamPlayer.player_id
             ).join(
-                Match, MatchStats.match_id == Match.id
+                # Only matches within the player's tenure in the team
+                Match, and_(
+                    Match.id == MatchStats.match_id,
+                    Match.id >= TeamPlayer.joined_at_match,
+                    or_(TeamPlayer.left_at_match == None, Match.id < TeamPlayer.left_at_match)
+                )
             ).filter(
-                MatchStats.player_id == tp.player_id,
-                Match.id >= tp.joined_at_match
-            )
-            
-            # Filter by left_at_match if the player has left
-            if tp.left_at_match is not None:
-                match_stats_query = match_stats_query.filter(Match.id < tp.left_at_match)
-            
-            match_stats = match_stats_query.all()
-            
-            player_total_points = 0.0
-            match_details = []
-            
-            # Sum up points with multiplier applied
-            for stat in match_stats:
-                base_points = stat.base_points or 0
-                match_points = base_points * multiplier
-                player_total_points += match_points
-                
-                match_details.append({
-                    "match_id": stat.match_id,
-                    "match_name": stat.match_name,
-                    "base_points": base_points,
-                    "multiplier": multiplier,
-                    "total_points": match_points
-                })
-            
-            # Only include players who scored points
-            if player_total_points > 0:
-                player = db.query(Player).filter(Player.id == tp.player_id).first()
-                player_name = player.player_name if player else f"Unknown Player ({tp.player_id})"
-                
-                player_contributions.append({
-                    "player_id": tp.player_id,
-                    "player_name": player_name,
-                    "is_captain": tp.is_captain,
-                    "is_vice_captain": tp.is_vice_captain,
-                    "total_points": player_total_points,
-                    "matches": match_details
-                })
-                
+                TeamPlayer.id.in_(contributions_by_tenure)
+            ).order_by(TeamPlayer.id, MatchStats.id).all()
+
+            total_team_points = 0.0
+            for team_player_id, tenure_rows in groupby(match_rows, key=lambda row: row.team_player_id):
+                contribution = contributions_by_tenure[team_player_id]
+                player_total_points = 0.0
+                match_details = []
+
+                # Sum up points with multiplier applied
+                for stat in tenure_rows:
+                    multiplier = float(stat.multiplier)
+                    base_points = stat.base_points or 0
+                    match_points = base_points * multiplier
+                    player_total_points += match_points
+
+                    match_details.append({
+                        "match_id": stat.match_id,
+                        "match_name": stat.match_name,
+                        "base_points": base_points,
+                        "multiplier": multiplier,
+                        "total_points": match_points
+                    })
+
+                # Per-match sums keep the totals consistent with the breakdown
+                contribution["total_points"] = player_total_points
+                contribution["matches"] = match_details
                 total_team_points += player_total_points
         
-        # Sort player contributions by points (highest first)
-        player_contributions.sort(key=lambda p: p["total_points"], reverse=True)
-        
-        return {
+        # Plain dicts of primitives go straight to orjson
+        return ORJSONResponse({
             "team_id": team_id,
             "team_name": team.team_name,
             "team_code": team.team_code,
             "total_points": total_team_points,
             "player_contributions": player_contributions
-        }
+        })
         
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
-        print(f"Error calculating team points: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error calculating team points")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
 @app.post("/admin/run-daily-update/", response_model=ActionResponse)
-async def trigger_daily_update(api_key: str = Body(..., embed=True)):
+def trigger_daily_update(api_key: str = Body(..., embed=True)):
     """
     Trigger the daily update process manually or via a scheduled task.
     Protected by API key to prevent unauthorized access.
@@ -778,9 +929,7 @@ async def trigger_daily_update(api_key: str = Body(..., embed=True)):
             }
         )
     except Exception as e:
-        print(f"Error running daily update: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error running daily update")
         raise HTTPException(status_code=500, detail=f"Error during daily update: {str(e)}")
 
 
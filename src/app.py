@@ -12,6 +12,7 @@ sys.path.insert(0, str(src_path))
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,12 +27,14 @@ from auction.websocket import router as websocket_router
 
 # Import models to ensure tables are created
 from models.base import init_db
+from log_config import setup_logging, shutdown_logging
 
 # Create FastAPI app
 app = FastAPI(
     title="Cricket Auction Platform API",
     description="Real-time auction platform for IPL fantasy leagues and community cricket",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -48,10 +51,17 @@ app.add_middleware(
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup."""
+    """Initialize logging and database tables on startup."""
+    setup_logging()
     init_db()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending log records."""
+    shutdown_logging()
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -2,22 +2,35 @@
 Auction Manager - State machine for live auction management.
 Handles bidding logic, player presentation, and state tracking.
 """
-from typing import Dict, Optional, List
-from decimal import Decimal
-from sqlalchemy.orm import Session
+from typing import Dict, NamedTuple, Optional, List
+from bisect import bisect_right
+from datetime import datetime
+import math
+import os
+import sys
+import time
+from sqlalchemy import func, case, and_, or_, exists, insert, update, text
+from sqlalchemy.orm import Session, joinedload
 import json
 
-from models.auction import AuctionEvent, AuctionPlayer, AuctionBid
+from models.auction import AuctionEvent, AuctionPlayer, AuctionBid, AuctionPlayerStatus
 from models.team import Team, TeamPlayer, PlayerTransfer
-from auction.schemas import AuctionState, TeamState, PlayerState
+from auction.schemas import AuctionState, TeamState, PlayerState, StateUpdateMessage
+
+
+def to_cents(amount: float) -> int:
+    """Convert a crore amount to integer hundredths (0.05 -> 5)."""
+    if math.isinf(amount):
+        return sys.maxsize
+    return int(round(amount * 100))
 
 
 class BidIncrementTier:
-    """Bid increment tier configuration."""
+    """Bid increment tier configuration, stored in integer hundredths of a crore."""
     def __init__(self, min_bid: float, max_bid: float, increment: float):
-        self.min_bid = Decimal(str(min_bid))
-        self.max_bid = Decimal(str(max_bid))
-        self.increment = Decimal(str(increment))
+        self.min_cents = to_cents(min_bid)
+        self.max_cents = to_cents(max_bid)
+        self.increment_cents = to_cents(increment)
 
 
 # Default IPL-style bid increments
@@ -28,6 +41,66 @@ DEFAULT_TIERS = [
     BidIncrementTier(5, float('inf'), 0.25)
 ]
 
+class TeamInfo(NamedTuple):
+    """Team fields that do not change during bidding."""
+    id: int
+    name: str
+    code: str
+
+
+class CurrentPlayerInfo(NamedTuple):
+    """Fields of the player on the block needed to close their sale."""
+    id: int
+    player_id: Optional[int]
+    custom_name: Optional[str]
+    display_name: str
+
+
+# auction_id -> (raw bid_increment_tiers JSON, sorted tiers, tier lower bounds)
+_TIER_CACHE: Dict[int, tuple] = {}
+
+# Opt-in single round-trip bid path (PostgreSQL only)
+SQL_BID_PATH = os.getenv("AUCTION_SQL_BID_PATH", "false").lower() in ("1", "true", "yes")
+
+# Checks, records and applies a bid in one statement. The bid state the caller
+# validated against (expected_*) must still hold, so a stale cache or a lost
+# race returns no row instead of applying the bid.
+PLACE_BID_SQL = text("""
+WITH chk AS (
+    SELECT a.id AS auction_id,
+           p.id AS auction_player_id,
+           p.base_price,
+           COALESCE(pl.player_name, NULLIF(p.custom_name, ''), 'Unknown Player') AS player_name,
+           t.team_name
+    FROM auction_events a
+    JOIN auction_players p
+      ON p.id = a.current_player_id AND p.status_code = :current_status
+    LEFT JOIN players pl ON pl.id = p.player_id
+    JOIN teams t
+      ON t.id = :team_id AND t.auction_id = a.id AND t.purse_remaining >= :amount
+    WHERE a.id = :auction_id
+      AND a.status = 'live'
+      AND a.current_player_id = :expected_player_id
+      AND a.current_bid IS NOT DISTINCT FROM CAST(:expected_bid AS DOUBLE PRECISION)
+      AND a.current_bid_team_id IS NOT DISTINCT FROM CAST(:expected_team_id AS INTEGER)
+      AND :amount >= COALESCE(CAST(:min_bid AS DOUBLE PRECISION), p.base_price)
+    FOR UPDATE OF a
+),
+ins AS (
+    INSERT INTO auction_bids (auction_id, auction_player_id, team_id, bid_amount, is_winning_bid, created_at)
+    SELECT auction_id, auction_player_id, :team_id, :amount, FALSE, :now FROM chk
+    RETURNING id
+)
+UPDATE auction_events
+SET current_bid = :amount,
+    current_bid_team_id = :team_id,
+    current_bid_id = ins.id,
+    updated_at = :now
+FROM ins, chk
+WHERE auction_events.id = chk.auction_id
+RETURNING chk.auction_player_id, chk.player_name, chk.team_name, chk.base_price
+""")
+
 
 class AuctionManager:
     """
@@ -45,8 +118,22 @@ class AuctionManager:
         self.db = db
         self.bid_tiers: List[BidIncrementTier] = DEFAULT_TIERS
         
+        # Cached broadcast state, rebuilt only after a state-mutating op
+        self._state_version: int = 0
+        self._cached_state: Optional[AuctionState] = None
+        self._cached_state_json: Optional[bytes] = None
+        self._cached_state_key: Optional[tuple] = None
+        # time.monotonic() of the last check of the cache against the database
+        self._cached_state_checked_at: float = 0.0
+        # Snapshot of the player on the block, taken in present_player
+        self._current_player: Optional[CurrentPlayerInfo] = None
+        # Set by mark_stale() from other threads, applied on the manager's own thread
+        self._stale = False
+        self._teams_stale = False
+        
         # Load auction from database
         self._load_auction()
+        self._load_team_static()
     
     def _load_auction(self):
         """Load auction data from database."""
@@ -57,234 +144,415 @@ class AuctionManager:
         if not self.auction:
             raise ValueError(f"Auction {self.auction_id} not found")
         
+        self.bid_tiers, self._tier_mins = self._get_tiers(
+            self.auction_id, self.auction.bid_increment_tiers
+        )
+    
+    @staticmethod
+    def _get_tiers(auction_id: int, tiers_json: Optional[str]) -> tuple[List[BidIncrementTier], List[int]]:
+        """
+        Get the sorted bid tiers and their lower bounds for an auction.
+        
+        Parsed tiers are cached per auction together with the raw JSON they came
+        from, so a config change made elsewhere is picked up on the next load.
+        """
+        cached = _TIER_CACHE.get(auction_id)
+        if cached and cached[0] == tiers_json:
+            return cached[1], cached[2]
+        
+        bid_tiers = DEFAULT_TIERS
         # Parse custom bid tiers if defined
-        if self.auction.bid_increment_tiers:
+        if tiers_json:
             try:
-                tiers_data = json.loads(self.auction.bid_increment_tiers)
-                self.bid_tiers = [
+                tiers_data = json.loads(tiers_json)
+                bid_tiers = [
                     BidIncrementTier(t["min"], t["max"], t["increment"])
                     for t in tiers_data
                 ]
-            except (json.JSONDecodeError, KeyError):
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
                 pass  # Use default tiers
+        
+        # Sorted tier bounds for binary search in _increment_cents
+        bid_tiers = sorted(bid_tiers, key=lambda t: t.min_cents)
+        tier_mins = [t.min_cents for t in bid_tiers]
+        _TIER_CACHE[auction_id] = (tiers_json, bid_tiers, tier_mins)
+        return bid_tiers, tier_mins
     
     def refresh(self):
         """Refresh auction data from database."""
         self.db.refresh(self.auction)
     
-    def get_increment_for_bid(self, current_bid: float) -> Decimal:
+    def invalidate_state(self):
+        """Drop the cached broadcast state after a mutation."""
+        self._state_version += 1
+        self._cached_state = None
+        self._cached_state_json = None
+    
+    def mark_stale(self, teams: bool = False):
+        """
+        Flag the cached state (and teams) as changed outside this manager.
+        
+        Only sets flags, so it is safe to call from request threads; the reload
+        runs on the manager's own thread at the next bid check or state build.
+        """
+        self._stale = True
+        if teams:
+            self._teams_stale = True
+    
+    def _apply_stale(self):
+        """Apply invalidations flagged by mark_stale."""
+        if self._teams_stale:
+            # Cleared first so a flag set during the reload is not lost
+            self._teams_stale = self._stale = False
+            self.invalidate_teams()
+        elif self._stale:
+            self._stale = False
+            self.invalidate_state()
+    
+    def _load_team_static(self):
+        """Cache this auction's team names/codes and purses."""
+        team_static: Dict[int, TeamInfo] = {}
+        # Purses only change on sell_player; get_state also refreshes them on every rebuild
+        purse: Dict[int, float] = {}
+        for team_id, name, code, team_purse in self.db.query(
+            Team.id, Team.team_name, Team.team_code, Team.purse_remaining
+        ).filter(Team.auction_id == self.auction_id):
+            team_static[team_id] = TeamInfo(team_id, name, code)
+            purse[team_id] = team_purse
+        # Swapped in whole, never seen half-filled
+        self._team_static = team_static
+        self._purse = purse
+    
+    def _get_current_player(self) -> CurrentPlayerInfo:
+        """Player on the block, from the snapshot taken when it was presented."""
+        current = self._current_player
+        if current is None or current.id != self.auction.current_player_id:
+            # Presented by another manager/worker
+            player = self.db.query(AuctionPlayer).options(
+                joinedload(AuctionPlayer.player)
+            ).filter(
+                AuctionPlayer.id == self.auction.current_player_id
+            ).first()
+            if not player:
+                raise ValueError("Player not found in auction pool")
+            current = CurrentPlayerInfo(player.id, player.player_id, player.custom_name, player.display_name)
+            self._current_player = current
+        return current
+    
+    def invalidate_teams(self):
+        """Reload cached team names/codes after teams are added, edited or removed."""
+        self._load_team_static()
+        self.invalidate_state()
+    
+    def _increment_cents(self, bid_cents: int) -> int:
+        """Get the increment, in hundredths, for a bid in hundredths."""
+        index = bisect_right(self._tier_mins, bid_cents) - 1
+        if index >= 0 and bid_cents < self.bid_tiers[index].max_cents:
+            return self.bid_tiers[index].increment_cents
+        return self.bid_tiers[-1].increment_cents  # Use last tier for very high bids
+    
+    def get_increment_for_bid(self, current_bid: float) -> float:
         """Get the minimum increment for a given bid amount."""
-        bid = Decimal(str(current_bid))
-        for tier in self.bid_tiers:
-            if tier.min_bid <= bid < tier.max_bid:
-                return tier.increment
-        return self.bid_tiers[-1].increment  # Use last tier for very high bids
+        return self._increment_cents(to_cents(current_bid)) / 100.0
     
     def get_minimum_bid(self, base_price: float, current_bid: Optional[float]) -> float:
         """Calculate minimum valid bid amount."""
         if current_bid is None:
             return base_price
         
-        increment = self.get_increment_for_bid(current_bid)
-        return float(Decimal(str(current_bid)) + increment)
+        bid_cents = to_cents(current_bid)
+        return (bid_cents + self._increment_cents(bid_cents)) / 100.0
     
-    def validate_bid(self, team_id: int, amount: float) -> tuple[bool, str]:
+    def _check_bid(self, auction: AuctionEvent, team_id: int, amount: float) -> tuple[TeamInfo, AuctionPlayer]:
         """
-        Validate a bid.
+        Run all bid checks against an already loaded auction row.
         
-        Returns:
-            (is_valid, error_message)
+        Returns (team, current_player) or raises ValueError.
         """
+        self._apply_stale()
+        
         # Check auction is live
-        if self.auction.status != "live":
-            return False, "Auction is not live"
+        if auction.status != "live":
+            raise ValueError("Auction is not live")
         
         # Check there's a current player
-        if not self.auction.current_player_id:
-            return False, "No player is currently being auctioned"
+        if not auction.current_player_id:
+            raise ValueError("No player is currently being auctioned")
         
-        # Get current player
         current_player = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.id == self.auction.current_player_id
+            AuctionPlayer.id == auction.current_player_id
         ).first()
         
-        if not current_player or current_player.status != "current":
-            return False, "No active player auction"
+        if not current_player or current_player.status_code != AuctionPlayerStatus.CURRENT:
+            raise ValueError("No active player auction")
         
-        # Get team
-        team = self.db.query(Team).filter(
-            Team.id == team_id,
-            Team.auction_id == self.auction_id
-        ).first()
+        # Teams and purses come from the manager's cache, reloaded for unknown teams
+        if team_id not in self._team_static:
+            self._load_team_static()
+        team = self._team_static.get(team_id)
         
         if not team:
-            return False, "Team not found in this auction"
+            raise ValueError("Team not found in this auction")
         
         # Check purse
-        if team.purse_remaining < amount:
-            return False, f"Insufficient purse ({team.purse_remaining} < {amount})"
+        purse = self._purse[team_id]
+        if purse < amount:
+            raise ValueError(f"Insufficient purse ({purse} < {amount})")
         
         # Check minimum bid
         min_bid = self.get_minimum_bid(
             current_player.base_price,
-            self.auction.current_bid
+            auction.current_bid
         )
         
         if amount < min_bid:
-            return False, f"Bid must be at least {min_bid}"
+            raise ValueError(f"Bid must be at least {min_bid}")
         
         # Check not already highest bidder
-        if self.auction.current_bid_team_id == team_id:
-            return False, "You are already the highest bidder"
+        if auction.current_bid_team_id == team_id:
+            raise ValueError("You are already the highest bidder")
         
+        return team, current_player
+    
+    def validate_bid(self, team_id: int, amount: float) -> tuple[bool, str]:
+        """
+        Validate a bid.
+        
+        Returns:
+            (is_valid, error_message)
+        """
+        try:
+            self._check_bid(self.auction, team_id, amount)
+        except ValueError as e:
+            self.db.rollback()
+            return False, str(e)
         return True, ""
     
     def place_bid(self, team_id: int, amount: float) -> dict:
         """
         Place a bid for the current player.
         
-        Uses database-level locking (SELECT FOR UPDATE) to prevent race conditions
-        when multiple teams bid simultaneously.
+        The bid is validated against a fresh read of the auction row and then
+        applied with a conditional UPDATE that only matches if the bid state is
+        still the one validated against, so concurrent bids never wait on a row
+        lock; the loser of a race gets an error instead.
         
         Returns bid result with next minimum bid.
         """
-        # Lock the auction row to prevent race conditions
-        # This ensures only one bid can be processed at a time
-        locked_auction = self.db.query(AuctionEvent).filter(
-            AuctionEvent.id == self.auction_id
-        ).with_for_update().first()
-        
-        if not locked_auction:
-            raise ValueError("Auction not found")
-        
-        # Re-validate with locked data (bid state may have changed)
-        if locked_auction.status != "live":
-            raise ValueError("Auction is not live")
-        
-        if not locked_auction.current_player_id:
-            raise ValueError("No player is currently being auctioned")
-        
-        current_player = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.id == locked_auction.current_player_id
-        ).first()
-        
-        if not current_player or current_player.status != "current":
-            raise ValueError("No active player auction")
-        
-        team = self.db.query(Team).filter(
-            Team.id == team_id,
-            Team.auction_id == self.auction_id
-        ).first()
-        
-        if not team:
-            raise ValueError("Team not found in this auction")
-        
-        # Check purse
-        if team.purse_remaining < amount:
-            raise ValueError(f"Insufficient purse ({team.purse_remaining} < {amount})")
-        
-        # Check minimum bid with current locked state
-        min_bid = self.get_minimum_bid(
-            current_player.base_price,
-            locked_auction.current_bid
-        )
-        
-        if amount < min_bid:
-            raise ValueError(f"Bid must be at least {min_bid}")
+        if SQL_BID_PATH and self.db.get_bind().dialect.name == "postgresql":
+            result = self._place_bid_single_statement(team_id, amount)
+            if result is not None:
+                return result
+        
+        # A rejected bid ends its transaction, so the long-lived session does
+        # not sit idle in one until the next bid
+        try:
+            auction = self.db.query(AuctionEvent).filter(
+                AuctionEvent.id == self.auction_id
+            ).populate_existing().first()
+            
+            if not auction:
+                raise ValueError("Auction not found")
+            
+            team, current_player = self._check_bid(auction, team_id, amount)
+            
+            # Record the bid; its id becomes the auction's current_bid_id
+            bid_id = self.db.execute(insert(AuctionBid).values(
+                auction_id=self.auction_id,
+                auction_player_id=current_player.id,
+                team_id=team_id,
+                bid_amount=amount
+            )).inserted_primary_key[0]
+            
+            # Compare-and-set on the state we validated against; the purse is
+            # re-checked in the same statement
+            applied = self.db.execute(
+                update(AuctionEvent).where(
+                    AuctionEvent.id == self.auction_id,
+                    AuctionEvent.status == "live",
+                    AuctionEvent.current_player_id == current_player.id,
+                    AuctionEvent.current_bid.is_(None) if auction.current_bid is None
+                    else AuctionEvent.current_bid == auction.current_bid,
+                    AuctionEvent.current_bid_team_id.is_(None) if auction.current_bid_team_id is None
+                    else AuctionEvent.current_bid_team_id == auction.current_bid_team_id,
+                    exists().where(Team.id == team_id, Team.purse_remaining >= amount)
+                ).values(
+                    current_bid=amount,
+                    current_bid_team_id=team_id,
+                    current_bid_id=bid_id
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            
+            if applied != 1:
+                # Also discards the bid row recorded above
+                self.db.rollback()
+                # The cached purse may be stale if the team bought elsewhere
+                self._load_team_static()
+                if self._purse.get(team_id, 0.0) < amount:
+                    raise ValueError(f"Insufficient purse ({self._purse.get(team_id, 0.0)} < {amount})")
+                raise ValueError("Another bid was placed first, please bid again")
+        except ValueError:
+            self.db.rollback()
+            raise
+        
+        # Build the result before committing; commit expires the loaded rows
+        # and reading them afterwards would reload each one
+        result = {
+            "player_id": current_player.id,
+            "player_name": current_player.display_name,
+            "team_id": team_id,
+            "team_name": team.name,
+            "amount": amount,
+            "next_minimum": self.get_minimum_bid(current_player.base_price, amount)
+        }
         
-        # Check not already highest bidder
-        if locked_auction.current_bid_team_id == team_id:
-            raise ValueError("You are already the highest bidder")
+        self.db.commit()
+        self.invalidate_state()
         
-        # Record the bid
-        bid = AuctionBid(
-            auction_id=self.auction_id,
-            auction_player_id=current_player.id,
-            team_id=team_id,
-            bid_amount=amount
-        )
-        self.db.add(bid)
+        return result
+    
+    def _place_bid_single_statement(self, team_id: int, amount: float) -> Optional[dict]:
+        """
+        Place a bid with PLACE_BID_SQL, validated against the cached auction row.
         
-        # Update auction state atomically
-        locked_auction.current_bid = amount
-        locked_auction.current_bid_team_id = team_id
+        Returns None when the statement did not apply (stale cache, failed check
+        or lost race); place_bid then takes the ORM path, which re-reads the
+        auction and reports the exact error.
+        """
+        auction = self.auction
+        if not auction.current_player_id or auction.current_bid_team_id == team_id:
+            return None
+        
+        # With no bid yet the player's base price is the minimum, checked in SQL
+        min_bid = None
+        if auction.current_bid is not None:
+            min_bid = self.get_minimum_bid(0, auction.current_bid)
+            if amount < min_bid:
+                return None
+        
+        row = self.db.execute(PLACE_BID_SQL, {
+            "auction_id": self.auction_id,
+            "team_id": team_id,
+            "amount": amount,
+            "min_bid": min_bid,
+            "current_status": int(AuctionPlayerStatus.CURRENT),
+            "expected_player_id": auction.current_player_id,
+            "expected_bid": auction.current_bid,
+            "expected_team_id": auction.current_bid_team_id,
+            "now": datetime.utcnow()
+        }).first()
+        if row is None:
+            return None
         
         self.db.commit()
-        self.db.refresh(self.auction)  # Refresh our cached auction
+        self.invalidate_state()
         
         return {
-            "player_id": current_player.id,
-            "player_name": current_player.display_name,
+            "player_id": row.auction_player_id,
+            "player_name": row.player_name,
             "team_id": team_id,
-            "team_name": team.team_name,
+            "team_name": row.team_name,
             "amount": amount,
-            "next_minimum": self.get_minimum_bid(current_player.base_price, amount)
+            "next_minimum": self.get_minimum_bid(row.base_price, amount)
         }
     
     def present_player(self, auction_player_id: int) -> PlayerState:
         """Put a player up for bidding."""
-        player = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.id == auction_player_id,
-            AuctionPlayer.auction_id == self.auction_id
-        ).first()
-        
-        if not player:
-            raise ValueError("Player not found in auction pool")
-        
-        if player.status != "available":
-            raise ValueError(f"Player is {player.status}, not available")
-        
-        # Clear any previous current player
-        self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.auction_id == self.auction_id,
-            AuctionPlayer.status == "current"
-        ).update({"status": "available"})
+        try:
+            player = self.db.query(AuctionPlayer).filter(
+                AuctionPlayer.id == auction_player_id,
+                AuctionPlayer.auction_id == self.auction_id
+            ).first()
+            
+            if not player:
+                raise ValueError("Player not found in auction pool")
+            
+            if player.status_code != AuctionPlayerStatus.AVAILABLE:
+                raise ValueError(f"Player is {player.status}, not available")
+        except ValueError:
+            self.db.rollback()
+            raise
+        
+        # Set this player as current and put any previous current player back
+        # in the pool, in a single UPDATE
+        self.db.execute(
+            update(AuctionPlayer).where(
+                AuctionPlayer.auction_id == self.auction_id,
+                or_(
+                    AuctionPlayer.id == player.id,
+                    AuctionPlayer.status_code == AuctionPlayerStatus.CURRENT
+                )
+            ).values(
+                status_code=case(
+                    (AuctionPlayer.id == player.id, AuctionPlayerStatus.CURRENT),
+                    else_=AuctionPlayerStatus.AVAILABLE
+                )
+            ).execution_options(synchronize_session=False)
+        )
         
-        # Set this player as current
-        player.status = "current"
         self.auction.current_player_id = player.id
         self.auction.current_bid = None
         self.auction.current_bid_team_id = None
+        self.auction.current_bid_id = None
         
-        self.db.commit()
-        self.refresh()
-        
-        return PlayerState(
+        presented = PlayerState(
             id=player.id,
             name=player.display_name,
             base_price=player.base_price
         )
+        self._current_player = CurrentPlayerInfo(
+            player.id, player.player_id, player.custom_name, presented.name
+        )
+        
+        self.db.commit()
+        self.invalidate_state()
+        
+        return presented
     
     def sell_player(self) -> dict:
         """Confirm sale of current player to highest bidder."""
-        if not self.auction.current_player_id:
-            raise ValueError("No player being auctioned")
-        
-        if not self.auction.current_bid_team_id:
-            raise ValueError("No bids placed, cannot sell")
-        
-        player = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.id == self.auction.current_player_id
-        ).first()
+        try:
+            if not self.auction.current_player_id:
+                raise ValueError("No player being auctioned")
+            
+            if not self.auction.current_bid_team_id:
+                raise ValueError("No bids placed, cannot sell")
+            
+            player = self._get_current_player()
+        except ValueError:
+            self.db.rollback()
+            raise
         
         team = self.db.query(Team).filter(
             Team.id == self.auction.current_bid_team_id
         ).first()
         
         # Update player status
-        player.status = "sold"
-        player.sold_for = self.auction.current_bid
-        player.sold_to_team_id = team.id
+        self.db.execute(
+            update(AuctionPlayer).where(AuctionPlayer.id == player.id).values(
+                status_code=AuctionPlayerStatus.SOLD,
+                sold_for=self.auction.current_bid,
+                sold_to_team_id=team.id
+            ).execution_options(synchronize_session=False)
+        )
         
         # Update team purse
         team.purse_remaining -= self.auction.current_bid
+        self._purse[team.id] = team.purse_remaining
         
         # Mark winning bid
-        self.db.query(AuctionBid).filter(
-            AuctionBid.auction_player_id == player.id,
-            AuctionBid.team_id == team.id,
-            AuctionBid.bid_amount == self.auction.current_bid
-        ).update({"is_winning_bid": True})
+        if self.auction.current_bid_id:
+            winning_bid = AuctionBid.id == self.auction.current_bid_id
+        else:
+            # Bids placed before current_bid_id was tracked
+            winning_bid = and_(
+                AuctionBid.auction_player_id == player.id,
+                AuctionBid.team_id == team.id,
+                AuctionBid.bid_amount == self.auction.current_bid
+            )
+        self.db.query(AuctionBid).filter(winning_bid).update(
+            {"is_winning_bid": True}, synchronize_session=False
+        )
         
         # Create team player record
         team_player = TeamPlayer(
@@ -319,22 +587,30 @@ class AuctionManager:
         self.auction.current_player_id = None
         self.auction.current_bid = None
         self.auction.current_bid_team_id = None
+        self.auction.current_bid_id = None
+        self._current_player = None
         
         self.db.commit()
-        self.refresh()
+        self.invalidate_state()
         
         return result
     
     def unsold_player(self) -> dict:
         """Mark current player as unsold."""
-        if not self.auction.current_player_id:
-            raise ValueError("No player being auctioned")
-        
-        player = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.id == self.auction.current_player_id
-        ).first()
-        
-        player.status = "unsold"
+        try:
+            if not self.auction.current_player_id:
+                raise ValueError("No player being auctioned")
+            
+            player = self._get_current_player()
+        except ValueError:
+            self.db.rollback()
+            raise
+        
+        self.db.execute(
+            update(AuctionPlayer).where(AuctionPlayer.id == player.id).values(
+                status_code=AuctionPlayerStatus.UNSOLD
+            ).execution_options(synchronize_session=False)
+        )
         
         result = {
             "player_id": player.id,
@@ -344,47 +620,82 @@ class AuctionManager:
         self.auction.current_player_id = None
         self.auction.current_bid = None
         self.auction.current_bid_team_id = None
+        self.auction.current_bid_id = None
+        self._current_player = None
         
         self.db.commit()
-        self.refresh()
+        self.invalidate_state()
         
         return result
     
     def get_state(self) -> AuctionState:
         """Get full auction state for broadcast."""
+        self._apply_stale()
         self.refresh()
         
-        # Get teams
-        teams = self.db.query(Team).filter(Team.auction_id == self.auction_id).all()
-        team_states = []
-        for team in teams:
-            player_count = self.db.query(TeamPlayer).filter(
-                TeamPlayer.team_id == team.id,
-                TeamPlayer.left_at_match == None
-            ).count()
-            
-            team_states.append(TeamState(
-                id=team.id,
-                name=team.team_name,
-                code=team.team_code,
-                purse=team.purse_remaining,
+        # Bids or status changes made through another manager/worker still
+        # show up on the auction row, so they invalidate the cache as well
+        key = (
+            self._state_version,
+            self.auction.status,
+            self.auction.updated_at,
+            self.auction.current_player_id,
+            self.auction.current_bid,
+            self.auction.current_bid_team_id
+        )
+        self._cached_state_checked_at = time.monotonic()
+        if self._cached_state is not None and key == self._cached_state_key:
+            return self._cached_state
+        
+        # Teams with their active player counts in one query; the counts only
+        # aggregate this auction's rosters
+        active_counts = self.db.query(
+            TeamPlayer.team_id,
+            func.count().label("players_count")
+        ).join(
+            Team, Team.id == TeamPlayer.team_id
+        ).filter(
+            Team.auction_id == self.auction_id,
+            TeamPlayer.left_at_match == None
+        ).group_by(TeamPlayer.team_id).subquery()
+        
+        # Only the mutable team fields are read per call; ids/names/codes are cached
+        teams = self.db.query(
+            Team.id, Team.purse_remaining, func.coalesce(active_counts.c.players_count, 0)
+        ).outerjoin(
+            active_counts, active_counts.c.team_id == Team.id
+        ).filter(
+            Team.auction_id == self.auction_id
+        ).order_by(Team.id).all()
+        
+        if any(team_id not in self._team_static for team_id, _, _ in teams):
+            self._load_team_static()
+        self._purse.update((team_id, purse) for team_id, purse, _ in teams)
+        
+        team_states = [
+            TeamState.model_construct(
+                id=team_id,
+                name=self._team_static[team_id].name,
+                code=self._team_static[team_id].code,
+                purse=purse,
                 players_count=player_count
-            ))
+            )
+            for team_id, purse, player_count in teams
+        ]
         
         # Get current player if any
         current_player = None
         if self.auction.current_player_id:
-            player = self.db.query(AuctionPlayer).filter(
+            player = self.db.query(AuctionPlayer).options(
+                joinedload(AuctionPlayer.player)
+            ).filter(
                 AuctionPlayer.id == self.auction.current_player_id
             ).first()
             
             if player:
-                bidder_name = None
-                if self.auction.current_bid_team_id:
-                    bidder = self.db.query(Team).filter(
-                        Team.id == self.auction.current_bid_team_id
-                    ).first()
-                    bidder_name = bidder.team_name if bidder else None
+                # Bids are only accepted from this auction's teams
+                bidder = self._team_static.get(self.auction.current_bid_team_id)
+                bidder_name = bidder.name if bidder else None
                 
                 current_player = PlayerState(
                     id=player.id,
@@ -395,23 +706,17 @@ class AuctionManager:
                     current_bidder_name=bidder_name
                 )
         
-        # Get player counts
-        available = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.auction_id == self.auction_id,
-            AuctionPlayer.status == "available"
-        ).count()
-        
-        sold = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.auction_id == self.auction_id,
-            AuctionPlayer.status == "sold"
-        ).count()
-        
-        unsold = self.db.query(AuctionPlayer).filter(
-            AuctionPlayer.auction_id == self.auction_id,
-            AuctionPlayer.status == "unsold"
-        ).count()
+        # Get player counts per status in one query
+        status_counts = dict(
+            self.db.query(AuctionPlayer.status_code, func.count()).filter(
+                AuctionPlayer.auction_id == self.auction_id
+            ).group_by(AuctionPlayer.status_code).all()
+        )
+        available = status_counts.get(AuctionPlayerStatus.AVAILABLE, 0)
+        sold = status_counts.get(AuctionPlayerStatus.SOLD, 0)
+        unsold = status_counts.get(AuctionPlayerStatus.UNSOLD, 0)
         
-        return AuctionState(
+        state = AuctionState(
             auction_id=self.auction_id,
             status=self.auction.status,
             current_player=current_player,
@@ -420,3 +725,26 @@ class AuctionManager:
             sold_players=sold,
             unsold_players=unsold
         )
+        self._cached_state = state
+        self._cached_state_json = None
+        self._cached_state_key = key
+        return state
+    
+    def get_state_json(self) -> bytes:
+        """Get the state:update message as UTF-8 JSON, encoded once per state."""
+        state = self.get_state()
+        if self._cached_state_json is None:
+            message = StateUpdateMessage.make(data=state)
+            self._cached_state_json = message.to_json()
+        return self._cached_state_json
+    
+    def peek_state_json(self, max_age: float) -> Optional[bytes]:
+        """
+        The cached state:update message, without touching the database, if it
+        was checked against the database within max_age seconds.
+        """
+        if self._cached_state_json is None:
+            return None
+        if time.monotonic() - self._cached_state_checked_at > max_age:
+            return None
+        return self._cached_state_json
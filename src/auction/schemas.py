@@ -1,7 +1,7 @@
 """
 Pydantic schemas for WebSocket auction messages.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Literal
 from datetime import datetime
 
@@ -23,6 +23,7 @@ MessageType = Literal[
     "state:update",
     "bid:new",
     "player:sold",
+    "bid_and_state",
     "error",
     "connected"
 ]
@@ -31,6 +32,7 @@ MessageType = Literal[
 # --- Base Message ---
 class WSMessage(BaseModel):
     """Base WebSocket message."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: str
     data: Optional[dict] = None
 
@@ -39,6 +41,7 @@ class WSMessage(BaseModel):
 
 class BidPlaceMessage(BaseModel):
     """Message from client to place a bid."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["bid:place"] = "bid:place"
     team_id: int
     amount: float
@@ -46,26 +49,43 @@ class BidPlaceMessage(BaseModel):
 
 class PlayerPresentMessage(BaseModel):
     """Admin message to present a player for bidding."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["player:present"] = "player:present"
     auction_player_id: int
 
 
 class PlayerSellMessage(BaseModel):
     """Admin message to confirm player sale."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["player:sell"] = "player:sell"
     auction_player_id: int
 
 
 class PlayerUnsoldMessage(BaseModel):
     """Admin message to mark player as unsold."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["player:unsold"] = "player:unsold"
     auction_player_id: int
 
 
 # --- Server to Client Messages ---
 
+class ServerMessage(BaseModel):
+    """Base for messages the server builds from its own, already trusted values."""
+    
+    @classmethod
+    def make(cls, **fields):
+        """Build the message without running validation."""
+        return cls.model_construct(**fields)
+    
+    def to_json(self) -> bytes:
+        """Encode straight to JSON bytes with the model's prebuilt serializer."""
+        return self.__pydantic_serializer__.to_json(self)
+
+
 class TeamState(BaseModel):
     """Team state in auction."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     id: int
     name: str
     code: str
@@ -75,6 +95,7 @@ class TeamState(BaseModel):
 
 class PlayerState(BaseModel):
     """Current player being auctioned."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     id: int
     name: str
     base_price: float
@@ -85,6 +106,7 @@ class PlayerState(BaseModel):
 
 class AuctionState(BaseModel):
     """Full auction state broadcast."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     auction_id: int
     status: str  # draft, live, paused, completed
     current_player: Optional[PlayerState] = None
@@ -94,14 +116,16 @@ class AuctionState(BaseModel):
     unsold_players: int = 0
 
 
-class StateUpdateMessage(BaseModel):
+class StateUpdateMessage(ServerMessage):
     """Full state update broadcast."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["state:update"] = "state:update"
     data: AuctionState
 
 
-class BidNewMessage(BaseModel):
+class BidNewMessage(ServerMessage):
     """New bid broadcast."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["bid:new"] = "bid:new"
     player_id: int
     player_name: str
@@ -111,8 +135,9 @@ class BidNewMessage(BaseModel):
     next_minimum: float
 
 
-class PlayerSoldMessage(BaseModel):
+class PlayerSoldMessage(ServerMessage):
     """Player sold broadcast."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["player:sold"] = "player:sold"
     player_id: int
     player_name: str
@@ -121,15 +146,28 @@ class PlayerSoldMessage(BaseModel):
     sold_for: float
 
 
-class ErrorMessage(BaseModel):
+class BidAndStateMessage(ServerMessage):
+    """
+    Bids placed since the last state broadcast, together with the resulting state.
+    Assembled from the already encoded bid and state messages.
+    """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    type: Literal["bid_and_state"] = "bid_and_state"
+    bids: List[BidNewMessage]
+    state: StateUpdateMessage
+
+
+class ErrorMessage(ServerMessage):
     """Error message."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["error"] = "error"
     message: str
     code: Optional[str] = None
 
 
-class ConnectedMessage(BaseModel):
+class ConnectedMessage(ServerMessage):
     """Connection established message."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     type: Literal["connected"] = "connected"
     auction_id: int
     user_id: int
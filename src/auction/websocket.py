@@ -2,10 +2,14 @@
 WebSocket handler for real-time auction bidding.
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
-from sqlalchemy.orm import Session
-from typing import Dict, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
 import json
 import asyncio
+import logging
+import threading
+import orjson
 
 from models.base import SessionLocal
 from models.user import User
@@ -14,23 +18,168 @@ from models.team import Team
 from auth.jwt import verify_token
 from auction.manager import AuctionManager
 from auction.schemas import (
-    WSMessage, BidNewMessage, PlayerSoldMessage, 
-    StateUpdateMessage, ErrorMessage, ConnectedMessage
+    WSMessage, ServerMessage, BidNewMessage, PlayerSoldMessage, 
+    ErrorMessage, ConnectedMessage
 )
 
 router = APIRouter(tags=["Auction WebSocket"])
+logger = logging.getLogger(__name__)
+
+# Admin-only actions
+ADMIN_ACTIONS = frozenset({
+    "auction:start", "auction:pause", "auction:resume",
+    "player:present", "player:sell", "player:unsold"
+})
+# Roles allowed to place bids
+BIDDER_ROLES = frozenset({"admin", "team_owner"})
+
+# Sends slower than this drop the client from the broadcast audience
+SEND_TIMEOUT_SECONDS = 5.0
+# Cap on socket writes in flight at once across broadcasts
+MAX_CONCURRENT_SENDS = 100
+# Messages queued for a client before it is dropped as too slow
+OUTBOX_SIZE = 64
+# Queued messages are merged into one frame up to about this many bytes
+MAX_BATCH_BYTES = 64 * 1024
+# Connecting clients reuse a cached state this recently checked against the database
+STATE_CACHE_MAX_AGE_SECONDS = 0.5
+# State broadcasts requested within this window go out as one frame
+STATE_FLUSH_DELAY_SECONDS = 0.020
+# Threads building auction state off the event loop
+STATE_WORKERS = 4
+
+_STATE_POOL = ThreadPoolExecutor(max_workers=STATE_WORKERS, thread_name_prefix="auction-state")
+
+
+class Connection(NamedTuple):
+    """A client connected to an auction, with its outbound message queue."""
+    websocket: WebSocket
+    user_id: int
+    role: str
+    team_id: Optional[int]
+    outbox: asyncio.Queue
+    writer: asyncio.Task
+
+
+@dataclass
+class Room:
+    """
+    An auction's connections. Outboxes are kept in a flat list parallel to the
+    connections so broadcasts only walk queues; removal swaps with the last entry.
+    """
+    conns: List[Connection] = field(default_factory=list)
+    outboxes: List[asyncio.Queue] = field(default_factory=list)
+    # id(websocket) -> position in conns/outboxes; identity keys never call
+    # into the socket's __eq__/__hash__, and a listed conn keeps its socket alive
+    index: Dict[int, int] = field(default_factory=dict)
+    
+    def __len__(self) -> int:
+        return len(self.conns)
+    
+    def get(self, websocket: WebSocket) -> Optional[Connection]:
+        position = self.index.get(id(websocket))
+        return None if position is None else self.conns[position]
+    
+    def add(self, conn: Connection):
+        self.remove(conn.websocket)
+        self.index[id(conn.websocket)] = len(self.conns)
+        self.conns.append(conn)
+        self.outboxes.append(conn.outbox)
+    
+    def remove(self, websocket: WebSocket) -> Optional[Connection]:
+        position = self.index.pop(id(websocket), None)
+        if position is None:
+            return None
+        conn = self.conns[position]
+        last = self.conns.pop()
+        last_outbox = self.outboxes.pop()
+        if last is not conn:
+            self.conns[position] = last
+            self.outboxes[position] = last_outbox
+            self.index[id(last.websocket)] = position
+        return conn
+
+
+class StateReader:
+    """
+    Builds an auction's state:update message on the state pool.
+    
+    It owns a separate AuctionManager and session, used by one pool thread at
+    a time, so the state queries never share a session with the bid path or
+    run on the event loop.
+    """
+    
+    def __init__(self, auction_id: int):
+        self.auction_id = auction_id
+        self._lock = threading.Lock()
+        self._manager: Optional[AuctionManager] = None
+        self._closed = False
+        # Set from the event loop, applied on the next build
+        self._stale = False
+        self._stale_teams = False
+    
+    def mark_stale(self, teams: bool = False):
+        """Rebuild the state (and reload teams) on the next build."""
+        self._stale = True
+        if teams:
+            self._stale_teams = True
+    
+    def peek(self, max_age: float) -> Optional[bytes]:
+        """The cached message if fresh, without blocking or touching the database."""
+        if self._stale or self._manager is None or not self._lock.acquire(blocking=False):
+            return None
+        try:
+            return self._manager.peek_state_json(max_age)
+        finally:
+            self._lock.release()
+    
+    def build(self) -> Optional[bytes]:
+        """Build the state:update message (runs on the state pool)."""
+        with self._lock:
+            if self._closed:
+                return None
+            if self._manager is None:
+                self._manager = AuctionManager(self.auction_id, SessionLocal())
+                self._stale = self._stale_teams = False
+            
+            stale, stale_teams = self._stale, self._stale_teams
+            self._stale = self._stale_teams = False
+            if stale_teams:
+                self._manager.invalidate_teams()
+            elif stale:
+                self._manager.invalidate_state()
+            
+            try:
+                return self._manager.get_state_json()
+            finally:
+                # Don't sit in a read transaction between builds (it would
+                # hold up SQLite writers on the bid path)
+                self._manager.db.rollback()
+    
+    def close(self):
+        """Close the session once any running build finishes."""
+        with self._lock:
+            self._closed = True
+            if self._manager is not None:
+                self._manager.db.close()
+                self._manager = None
 
 
 class ConnectionManager:
     """Manages WebSocket connections for all auctions."""
     
     def __init__(self):
-        # auction_id -> set of (websocket, user_id, role, team_id)
-        self.connections: Dict[int, Set[tuple]] = {}
+        # auction_id -> Room
+        self.connections: Dict[int, Room] = {}
         # auction_id -> AuctionManager
         self.managers: Dict[int, AuctionManager] = {}
-        # Lock for thread safety
-        self._lock = asyncio.Lock()
+        # auction_id -> StateReader, building broadcast state off the event loop
+        self.state_readers: Dict[int, StateReader] = {}
+        self._send_slots = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        # auction_id -> scheduled state flush
+        self._state_flushes: Dict[int, asyncio.Task] = {}
+        # auction_id -> encoded bid:new messages waiting for that flush
+        self._pending_bids: Dict[int, List[bytes]] = {}
     
     async def connect(
         self, 
@@ -43,88 +192,268 @@ class ConnectionManager:
         """Add a new connection to an auction."""
         # Note: websocket.accept() is called in the handler before this
         
-        async with self._lock:
-            if auction_id not in self.connections:
-                self.connections[auction_id] = set()
-            
-            self.connections[auction_id].add((websocket, user_id, role, team_id))
+        # Messages to the client are queued and written by its own writer task
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        writer = asyncio.create_task(self._writer_loop(auction_id, websocket, outbox))
+        
+        # Room bookkeeping never awaits, so it cannot interleave with other
+        # coroutines on the loop and needs no lock
+        if auction_id not in self.connections:
+            self.connections[auction_id] = Room()
+            self.state_readers[auction_id] = StateReader(auction_id)
+        
+        self.connections[auction_id].add(
+            Connection(websocket, user_id, role, team_id, outbox, writer)
+        )
         
         # Send connected message
-        connected_msg = ConnectedMessage(
+        connected_msg = ConnectedMessage.make(
             auction_id=auction_id,
             user_id=user_id,
             role=role,
             team_id=team_id
         )
-        await websocket.send_json(connected_msg.model_dump())
+        self.send(auction_id, websocket, connected_msg)
         
         # Send current state
         await self.send_state(auction_id, websocket)
     
     async def disconnect(self, auction_id: int, websocket: WebSocket):
         """Remove a connection from an auction."""
-        async with self._lock:
-            if auction_id in self.connections:
-                # Find and remove the connection
-                to_remove = None
-                for conn in self.connections[auction_id]:
-                    if conn[0] == websocket:
-                        to_remove = conn
-                        break
-                
-                if to_remove:
-                    self.connections[auction_id].discard(to_remove)
-                
-                # Clean up empty sets
-                if not self.connections[auction_id]:
-                    del self.connections[auction_id]
-                    if auction_id in self.managers:
-                        del self.managers[auction_id]
-    
-    def get_manager(self, auction_id: int, db: Session) -> AuctionManager:
-        """Get or create an AuctionManager for an auction."""
+        self._discard(auction_id, [websocket])
+    
+    def _discard(self, auction_id: int, websockets: List[WebSocket]):
+        """Remove connections and stop their writers."""
+        room = self.connections.get(auction_id)
+        if room is None:
+            return
+        
+        for websocket in websockets:
+            conn = room.remove(websocket)
+            if conn and conn.writer is not asyncio.current_task():
+                conn.writer.cancel()
+        
+        # Clean up empty auctions
+        if not room:
+            del self.connections[auction_id]
+            auction_manager = self.managers.pop(auction_id, None)
+            if auction_manager:
+                auction_manager.db.close()
+            state_reader = self.state_readers.pop(auction_id, None)
+            if state_reader:
+                _STATE_POOL.submit(state_reader.close)
+    
+    def get_manager(self, auction_id: int) -> AuctionManager:
+        """
+        Get or create an AuctionManager for an auction.
+        
+        The manager keeps its own session for as long as the auction has
+        connections, so its loaded auction row never outlives its session.
+        """
         if auction_id not in self.managers:
-            self.managers[auction_id] = AuctionManager(auction_id, db)
+            self.managers[auction_id] = AuctionManager(auction_id, SessionLocal())
         return self.managers[auction_id]
     
-    async def broadcast(self, auction_id: int, message: dict):
+    def invalidate_state(self, auction_id: int):
+        """
+        Drop the cached state of an auction changed outside its manager.
+        
+        Called from sync routes on threadpool threads, so it only flags the
+        manager and state reader; each reloads on its own thread.
+        """
+        auction_manager = self.managers.get(auction_id)
+        if auction_manager:
+            auction_manager.mark_stale()
+        state_reader = self.state_readers.get(auction_id)
+        if state_reader:
+            state_reader.mark_stale()
+    
+    def invalidate_teams(self, auction_id: int):
+        """Reload the cached teams of an auction after team changes (flags only, as above)."""
+        auction_manager = self.managers.get(auction_id)
+        if auction_manager:
+            auction_manager.mark_stale(teams=True)
+        state_reader = self.state_readers.get(auction_id)
+        if state_reader:
+            state_reader.mark_stale(teams=True)
+    
+    def send(self, auction_id: int, websocket: WebSocket, message: ServerMessage):
+        """Queue a message for one client."""
+        self.send_payload(auction_id, websocket, message.to_json())
+    
+    def send_payload(self, auction_id: int, websocket: WebSocket, payload: bytes):
+        """Queue an already serialized (UTF-8 JSON) message for one client."""
+        room = self.connections.get(auction_id)
+        conn = room.get(websocket) if room else None
+        if conn is None:
+            return
+        try:
+            conn.outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            # The client's own replies back up too; its writer will drop it
+            pass
+    
+    async def broadcast(self, auction_id: int, message: ServerMessage):
         """Broadcast a message to all connections in an auction."""
-        if auction_id not in self.connections:
+        if not self.connections.get(auction_id):
             return
         
-        disconnected = []
-        for conn in self.connections[auction_id]:
-            websocket = conn[0]
+        # Bids still waiting on a state flush must not be overtaken
+        await self.flush_bids(auction_id)
+        # Serialize once and reuse the payload for every client
+        await self.broadcast_payload(auction_id, message.to_json())
+    
+    async def _safe_send(self, websocket: WebSocket, payload: bytes) -> bool:
+        """Send to one client as a binary frame; False if it failed or timed out."""
+        async with self._send_slots:
             try:
-                await websocket.send_json(message)
+                await asyncio.wait_for(websocket.send_bytes(payload), timeout=SEND_TIMEOUT_SECONDS)
+                return True
             except Exception:
-                disconnected.append(conn)
+                return False
+    
+    async def _writer_loop(self, auction_id: int, websocket: WebSocket, outbox: asyncio.Queue):
+        """
+        Write a client's queued messages in order until a send fails.
         
-        # Clean up disconnected
-        for conn in disconnected:
-            self.connections[auction_id].discard(conn)
+        Messages already waiting are sent together as a single JSON array frame.
+        """
+        carry = None
+        while True:
+            batch = [carry if carry is not None else await outbox.get()]
+            carry = None
+            size = len(batch[0])
+            while not outbox.empty():
+                payload = outbox.get_nowait()
+                if size + len(payload) > MAX_BATCH_BYTES:
+                    carry = payload
+                    break
+                batch.append(payload)
+                size += len(payload) + 1
+            
+            frame = batch[0] if len(batch) == 1 else b"[" + b",".join(batch) + b"]"
+            if not await self._safe_send(websocket, frame):
+                break
+        
+        self._discard(auction_id, [websocket])
+    
+    async def broadcast_payload(self, auction_id: int, payload: bytes):
+        """Queue an already serialized (UTF-8 JSON) message for all connections."""
+        # Enqueueing never waits on a socket, so one slow client cannot hold up the rest
+        room = self.connections.get(auction_id)
+        if room is None:
+            return
+        
+        slow = []
+        for position, outbox in enumerate(room.outboxes):
+            try:
+                outbox.put_nowait(payload)
+            except asyncio.QueueFull:
+                slow.append(room.conns[position].websocket)
+        
+        # Clients that fell a full queue behind are dropped
+        if slow:
+            self._discard(auction_id, slow)
+            for websocket in slow:
+                asyncio.create_task(self._close_slow(websocket))
+    
+    async def _close_slow(self, websocket: WebSocket):
+        """Close a client that could not keep up, without waiting on it forever."""
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=1013, reason="Client too slow"),
+                timeout=SEND_TIMEOUT_SECONDS
+            )
+        except Exception:
+            pass
     
     async def send_state(self, auction_id: int, websocket: WebSocket):
         """Send current auction state to a specific connection."""
-        db = SessionLocal()
-        try:
-            manager = self.get_manager(auction_id, db)
-            state = manager.get_state()
-            msg = StateUpdateMessage(data=state)
-            await websocket.send_json(msg.model_dump())
-        finally:
-            db.close()
+        state_reader = self.state_readers.get(auction_id)
+        if state_reader is None:
+            return
+        
+        # Connect storms are served from the cache without touching the database
+        payload = state_reader.peek(STATE_CACHE_MAX_AGE_SECONDS)
+        if payload is None:
+            payload = await self._build_state(state_reader)
+        if payload is not None:
+            self.send_payload(auction_id, websocket, payload)
+    
+    async def _build_state(self, state_reader: StateReader) -> Optional[bytes]:
+        """Build the state:update message on the state pool, keeping the loop free."""
+        return await asyncio.get_running_loop().run_in_executor(_STATE_POOL, state_reader.build)
     
     async def broadcast_state(self, auction_id: int):
-        """Broadcast current state to all connections."""
-        db = SessionLocal()
+        """
+        Schedule a state broadcast to all connections.
+        
+        Requests arriving before the flush runs are coalesced, so a burst of
+        bids sends the state once.
+        """
+        # Nobody is listening, so skip building the state at all
+        if not self.connections.get(auction_id):
+            return
+        # Whatever prompted the broadcast changed the state
+        self.state_readers[auction_id].mark_stale()
+        if auction_id not in self._state_flushes:
+            self._state_flushes[auction_id] = asyncio.create_task(self._flush_state(auction_id))
+    
+    async def broadcast_bid(self, auction_id: int, bid_message: BidNewMessage):
+        """Broadcast a new bid together with the next state broadcast."""
+        if not self.connections.get(auction_id):
+            return
+        self._pending_bids.setdefault(auction_id, []).append(bid_message.to_json())
+        await self.broadcast_state(auction_id)
+    
+    async def flush_bids(self, auction_id: int):
+        """Broadcast the bids waiting on the next state flush on their own."""
+        for payload in self._pending_bids.pop(auction_id, ()):
+            await self.broadcast_payload(auction_id, payload)
+    
+    async def _flush_state(self, auction_id: int):
+        """Broadcast the state once the coalescing window has passed."""
+        await asyncio.sleep(STATE_FLUSH_DELAY_SECONDS)
+        # Unmark before building the state so later requests schedule a new flush
+        self._state_flushes.pop(auction_id, None)
+        # The room may have emptied during the window
+        state_reader = self.state_readers.get(auction_id)
+        if state_reader is None:
+            self._pending_bids.pop(auction_id, None)
+            return
+        
+        # The bids stay pending during the build, so a message broadcast
+        # meanwhile flushes them ahead of itself
+        pending = self._pending_bids.get(auction_id)
+        count = len(pending) if pending else 0
         try:
-            manager = self.get_manager(auction_id, db)
-            state = manager.get_state()
-            msg = StateUpdateMessage(data=state)
-            await self.broadcast(auction_id, msg.model_dump())
-        finally:
-            db.close()
+            payload = await self._build_state(state_reader)
+        except Exception:
+            logger.exception("Error building auction state")
+            payload = None
+        
+        # Only the bids placed before the build are covered by its state
+        bids = []
+        if count and self._pending_bids.get(auction_id) is pending:
+            bids = pending[:count]
+            del pending[:count]
+            if not pending:
+                del self._pending_bids[auction_id]
+        
+        try:
+            if payload is None:
+                for bid in bids:
+                    await self.broadcast_payload(auction_id, bid)
+                return
+            if bids:
+                # BidAndStateMessage, spliced from the encoded messages
+                payload = (
+                    b'{"type":"bid_and_state","bids":[' + b",".join(bids)
+                    + b'],"state":' + payload + b"}"
+                )
+            await self.broadcast_payload(auction_id, payload)
+        except Exception:
+            logger.exception("Error broadcasting auction state")
 
 
 # Global connection manager
@@ -155,53 +484,54 @@ async def auction_websocket(
     # Must accept connection first to be able to send proper close codes
     await websocket.accept()
     
-    db = SessionLocal()
-    
     try:
-        # Authenticate
-        if not token:
-            await websocket.close(code=4001, reason="Authentication required")
-            return
-        
-        payload = verify_token(token)
-        if not payload:
-            await websocket.close(code=4001, reason="Invalid token")
-            return
-        
-        user_id = int(payload["sub"])
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.is_active:
-            await websocket.close(code=4001, reason="User not found or inactive")
-            return
-        
-        # Verify auction exists
-        auction = db.query(AuctionEvent).filter(AuctionEvent.id == auction_id).first()
-        if not auction:
-            await websocket.close(code=4004, reason="Auction not found")
-            return
-        
-        # Check access
-        is_authorized = (
-            user.is_admin() or 
-            auction.owner_id == user.id or
-            db.query(AuctionTeamAuth).filter(
-                AuctionTeamAuth.auction_id == auction_id,
-                AuctionTeamAuth.user_id == user_id
-            ).first() is not None
-        )
-        
-        if not is_authorized:
-            await websocket.close(code=4003, reason="Not authorized for this auction")
-            return
-        
-        # Get user's team if any
-        team = db.query(Team).filter(
-            Team.auction_id == auction_id,
-            Team.owner_id == user_id
-        ).first()
-        
-        role = get_user_role(user, auction, team)
-        team_id = team.id if team else None
+        # The session is only held for authentication; bidding goes through
+        # the auction manager's own session
+        with SessionLocal() as db:
+            # Authenticate
+            if not token:
+                await websocket.close(code=4001, reason="Authentication required")
+                return
+            
+            payload = verify_token(token)
+            if not payload:
+                await websocket.close(code=4001, reason="Invalid token")
+                return
+            
+            user_id = int(payload["sub"])
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user or not user.is_active:
+                await websocket.close(code=4001, reason="User not found or inactive")
+                return
+            
+            # Verify auction exists
+            auction = db.query(AuctionEvent).filter(AuctionEvent.id == auction_id).first()
+            if not auction:
+                await websocket.close(code=4004, reason="Auction not found")
+                return
+            
+            # Check access
+            is_authorized = (
+                user.is_admin() or 
+                auction.owner_id == user.id or
+                db.query(AuctionTeamAuth).filter(
+                    AuctionTeamAuth.auction_id == auction_id,
+                    AuctionTeamAuth.user_id == user_id
+                ).first() is not None
+            )
+            
+            if not is_authorized:
+                await websocket.close(code=4003, reason="Not authorized for this auction")
+                return
+            
+            # Get user's team if any
+            team = db.query(Team).filter(
+                Team.auction_id == auction_id,
+                Team.owner_id == user_id
+            ).first()
+            
+            role = get_user_role(user, auction, team)
+            team_id = team.id if team else None
         
         # Connect
         await manager.connect(auction_id, websocket, user_id, role, team_id)
@@ -209,21 +539,25 @@ async def auction_websocket(
         # Handle messages
         while True:
             try:
-                data = await websocket.receive_json()
-                await handle_message(auction_id, websocket, data, user, role, team_id, db)
+                # Text or binary frames are parsed as-is by orjson
+                # (which raises a json.JSONDecodeError subclass)
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                data = orjson.loads(message.get("bytes") or message.get("text") or "")
+                await handle_message(auction_id, websocket, data, user, role, team_id)
             except WebSocketDisconnect:
                 break
             except json.JSONDecodeError:
                 error = ErrorMessage(message="Invalid JSON")
-                await websocket.send_json(error.model_dump())
+                manager.send(auction_id, websocket, error)
     
     except WebSocketDisconnect:
         pass
-    except Exception as e:
-        print(f"WebSocket error: {e}")
+    except Exception:
+        logger.exception("WebSocket error")
     finally:
         await manager.disconnect(auction_id, websocket)
-        db.close()
 
 
 async def handle_message(
@@ -232,27 +566,22 @@ async def handle_message(
     data: dict,
     user: User,
     role: str,
-    team_id: Optional[int],
-    db: Session
+    team_id: Optional[int]
 ):
     """Handle incoming WebSocket messages."""
     msg_type = data.get("type")
     
     if not msg_type:
         error = ErrorMessage(message="Missing message type")
-        await websocket.send_json(error.model_dump())
+        manager.send(auction_id, websocket, error)
         return
     
-    auction_manager = manager.get_manager(auction_id, db)
-    
-    # Admin-only actions
-    admin_actions = ["auction:start", "auction:pause", "auction:resume", 
-                     "player:present", "player:sell", "player:unsold"]
+    auction_manager = manager.get_manager(auction_id)
     
-    if msg_type in admin_actions:
+    if msg_type in ADMIN_ACTIONS:
         if role != "admin":
             error = ErrorMessage(message="Admin access required", code="forbidden")
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
             return
         
         try:
@@ -264,14 +593,14 @@ async def handle_message(
             
             elif msg_type == "player:sell":
                 result = auction_manager.sell_player()
-                sold_msg = PlayerSoldMessage(
+                sold_msg = PlayerSoldMessage.make(
                     player_id=result["player_id"],
                     player_name=result["player_name"],
                     team_id=result["team_id"],
                     team_name=result["team_name"],
                     sold_for=result["sold_for"]
                 )
-                await manager.broadcast(auction_id, sold_msg.model_dump())
+                await manager.broadcast(auction_id, sold_msg)
             
             elif msg_type == "player:unsold":
                 auction_manager.unsold_player()
@@ -281,13 +610,13 @@ async def handle_message(
         
         except ValueError as e:
             error = ErrorMessage(message=str(e))
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
     
     # Team actions
     elif msg_type == "bid:place":
-        if role not in ("admin", "team_owner"):
+        if role not in BIDDER_ROLES:
             error = ErrorMessage(message="Must own a team to bid", code="forbidden")
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
             return
         
         bid_team_id = data.get("team_id") or team_id
@@ -295,20 +624,20 @@ async def handle_message(
         
         if not bid_team_id or not amount:
             error = ErrorMessage(message="team_id and amount required")
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
             return
         
         # Admin can bid for any team, team_owner only for their own
         if role == "team_owner" and bid_team_id != team_id:
             error = ErrorMessage(message="Can only bid for your own team", code="forbidden")
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
             return
         
         try:
             result = auction_manager.place_bid(bid_team_id, float(amount))
             
             # Broadcast the new bid
-            bid_msg = BidNewMessage(
+            bid_msg = BidNewMessage.make(
                 player_id=result["player_id"],
                 player_name=result["player_name"],
                 team_id=result["team_id"],
@@ -316,12 +645,12 @@ async def handle_message(
                 amount=result["amount"],
                 next_minimum=result["next_minimum"]
             )
-            await manager.broadcast(auction_id, bid_msg.model_dump())
-            await manager.broadcast_state(auction_id)
+            # Sent in the same frame as the state it leads to
+            await manager.broadcast_bid(auction_id, bid_msg)
         
         except ValueError as e:
             error = ErrorMessage(message=str(e))
-            await websocket.send_json(error.model_dump())
+            manager.send(auction_id, websocket, error)
     
     # State request
     elif msg_type == "state:request":
@@ -329,4 +658,4 @@ async def handle_message(
     
     else:
         error = ErrorMessage(message=f"Unknown message type: {msg_type}")
-        await websocket.send_json(error.model_dump())
+        manager.send(auction_id, websocket, error)
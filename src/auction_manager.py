@@ -1,20 +1,7 @@
-import os
-import sys
 from sqlalchemy.orm import Session
-from decimal import Decimal, getcontext
 
-# Set precision for Decimal operations if needed (default is usually sufficient)
-# getcontext().prec = 28
-
-# Add src directory to Python path to import database module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
-
-try:
-    from database import engine, SessionLocal, Player, Shroff_teams, TeamPlayer
-except ImportError as e:
-    print(f"Error importing database modules: {e}")
-    print("Ensure database.py is in the same directory or src is in the Python path.")
-    sys.exit(1)
+# src/ is on the path both when run as a script and when imported by daily_update
+from database import SessionLocal, Player, Shroff_teams, TeamPlayer
 
 # --- Auction Data ---
 
@@ -108,87 +95,103 @@ AUCTION_DATA = {
 
 # --- Functions ---
 
-def get_or_create_player(db: Session, player_name: str) -> Player:
-    """Fetches a player by name or creates a new one if not found."""
-    player = db.query(Player).filter(Player.player_name == player_name).first()
-    if player:
-        return player
-    else:
-        # Player not found, create a new entry
-        print(f"⚠️ Player '{player_name}' not found in database. Creating new record.")
-        new_player = Player(
-            player_name=player_name,
-            team="Unknown", # Cannot determine IPL team from auction data alone
-            # Initialize other stats to 0 or default values
-            matches_played=0,
-            total_runs=0,
-            total_balls_faced=0,
-            total_fours=0,
-            total_sixes=0,
-            total_wickets=0,
-            total_overs_bowled=0.0,
-            total_maidens=0,
-            total_runs_conceded=0,
-            total_catches=0,
-            total_stumpings=0,
-            total_run_outs=0,
-            total_fantasy_points=0.0
-        )
-        db.add(new_player)
-        db.commit()
-        db.refresh(new_player)
-        print(f"✅ Created new player: {player_name} (ID: {new_player.id})")
-        return new_player
+def _to_hundredths(amount: float) -> int:
+    """Prices have at most two decimals, so they are summed exactly as integer hundredths."""
+    return int(round(amount * 100))
+
+
+def _new_player(player_name: str) -> Player:
+    """A Player record for a name missing from the database, with zeroed stats."""
+    return Player(
+        player_name=player_name,
+        team="Unknown", # Cannot determine IPL team from auction data alone
+        # Initialize other stats to 0 or default values
+        matches_played=0,
+        total_runs=0,
+        total_balls_faced=0,
+        total_fours=0,
+        total_sixes=0,
+        total_wickets=0,
+        total_overs_bowled=0.0,
+        total_maidens=0,
+        total_runs_conceded=0,
+        total_catches=0,
+        total_stumpings=0,
+        total_run_outs=0,
+        total_fantasy_points=0.0
+    )
 
 def populate_auction_data(db: Session):
-    """Populates the TeamPlayer table from the auction data using Decimal for precision."""
-    print("Starting auction data population...")
-    # Use Decimal for the initial purse
-    initial_purse = Decimal('120.0')
-
+    """
+    Populates the TeamPlayer table from the auction data, with prices kept in integer hundredths.
+    Teams, players and active assignments are fetched up front, and everything is
+    written in a single commit.
+    """
+    initial_purse = _to_hundredths(120.0)
+
+    teams_by_name = {
+        team.team_name: team
+        for team in db.query(Shroff_teams).filter(Shroff_teams.team_name.in_(TEAM_MAP.values()))
+    }
+
+    # Fetch every auctioned player in one query and create the missing ones together
+    names = {player_name for players in AUCTION_DATA.values() for player_name, _ in players}
+    players_by_name = {}
+    for player in db.query(Player).filter(Player.player_name.in_(names)).order_by(Player.id):
+        # First match wins, as with a per-name .first()
+        players_by_name.setdefault(player.player_name, player)
+    # Created in the order the names first appear in the auction data
+    missing = [
+        player_name
+        for player_name in dict.fromkeys(name for players in AUCTION_DATA.values() for name, _ in players)
+        if player_name not in players_by_name
+    ]
+    for player_name in missing:
+        players_by_name[player_name] = _new_player(player_name)
+        db.add(players_by_name[player_name])
+    db.flush()
+
+    # Active assignments of those players, first one per player
+    assignments = {}
+    for assignment in db.query(TeamPlayer).filter(
+        TeamPlayer.player_id.in_([player.id for player in players_by_name.values()]),
+        TeamPlayer.left_at_match == None # Check active players
+    ).order_by(TeamPlayer.id):
+        assignments.setdefault(assignment.player_id, assignment)
+
+    warnings = []
+    summary = []
+    new_entries = []
     for team_abbr, players in AUCTION_DATA.items():
         full_team_name = TEAM_MAP.get(team_abbr)
         if not full_team_name:
-            print(f"❌ Error: Team abbreviation '{team_abbr}' not found in TEAM_MAP.")
+            warnings.append(f"❌ Error: Team abbreviation '{team_abbr}' not found in TEAM_MAP.")
             continue
 
-        # Find the Shroff team
-        shroff_team = db.query(Shroff_teams).filter(Shroff_teams.team_name == full_team_name).first()
+        shroff_team = teams_by_name.get(full_team_name)
         if not shroff_team:
-            print(f"❌ Error: Shroff team '{full_team_name}' not found in database. Skipping.")
+            warnings.append(f"❌ Error: Shroff team '{full_team_name}' not found in database. Skipping.")
             continue
 
-        print(f"Processing team: {full_team_name} ({team_abbr})")
-        # Initialize total spent as Decimal
-        total_spent = Decimal('0.0')
+        total_spent = 0
+        assigned = 0
 
         for player_name, price_float in players:
-            # Convert price to Decimal
-            price = Decimal(str(price_float)) # Convert float to string first for accuracy
-
-            # Get or create the player record
-            player = get_or_create_player(db, player_name)
-            if not player: # Should not happen with get_or_create, but check anyway
-                 print(f"❌ Error finding or creating player '{player_name}'. Skipping.")
-                 continue
+            price = _to_hundredths(price_float)
+            player = players_by_name[player_name]
 
             # Check if player already assigned to a team in this initial auction phase
-            existing_assignment = db.query(TeamPlayer).filter(
-                TeamPlayer.player_id == player.id,
-                TeamPlayer.left_at_match == None # Check active players
-            ).first()
+            existing_assignment = assignments.get(player.id)
 
             if existing_assignment:
                  # This player is already on a team - could be from a previous run or data issue
                  # For idempotency, let's check if it's the *same* team and price
-                 # Convert stored bought_for to Decimal for comparison
-                 if existing_assignment.team_id == shroff_team.id and Decimal(str(existing_assignment.bought_for)) == price and existing_assignment.joined_at_match == 0:
-                      print(f"ℹ️ Player '{player_name}' already assigned to '{full_team_name}' with correct price. Skipping.")
+                 if existing_assignment.team_id == shroff_team.id and _to_hundredths(existing_assignment.bought_for) == price and existing_assignment.joined_at_match == 0:
                       total_spent += price # Still account for spending if re-running
                       continue
                  else:
                       # Assigned elsewhere or different details - potential issue
-                      print(f"⚠️ Warning: Player '{player_name}' (ID: {player.id}) is already assigned (Team ID: {existing_assignment.team_id}, Joined: {existing_assignment.joined_at_match}). Check data.")
+                      warnings.append(f"⚠️ Warning: Player '{player_name}' (ID: {player.id}) is already assigned (Team ID: {existing_assignment.team_id}, Joined: {existing_assignment.joined_at_match}). Check data.")
                       # Decide how to handle: skip this assignment? Overwrite? For now, skip.
                       continue # Skip adding this player
 
@@ -196,32 +199,36 @@ def populate_auction_data(db: Session):
             team_player_entry = TeamPlayer(
                 team_id=shroff_team.id,
                 player_id=player.id,
-                bought_for=float(price), # Store back as float in DB if column is Float
+                bought_for=price / 100,
                 joined_at_match=0,  # 0 signifies the initial auction draft
                 is_captain=False,
                 is_vice_captain=False
                 # left_at_match remains None
             )
-            db.add(team_player_entry)
+            new_entries.append(team_player_entry)
+            assignments[player.id] = team_player_entry
             total_spent += price
-            print(f"  Assigning {player_name} (Price: {price})") # Print Decimal price
+            assigned += 1
 
-        # Update the team's purse using Decimal arithmetic
+        # Converted back to crore only when stored
         remaining_purse = initial_purse - total_spent
-        # Store as float if the DB column is Float, otherwise, it might store as string/numeric
-        shroff_team.purse = float(remaining_purse)
-        print(f"  Total spent by {team_abbr}: {total_spent}")
-        print(f"  Updating {full_team_name} purse to: {remaining_purse}")
-
-        # Commit changes for the current team
-        try:
-            db.commit()
-            print(f"✅ Committed data for team {full_team_name}")
-        except Exception as e:
-            db.rollback()
-            print(f"❌ Error committing data for team {full_team_name}: {e}")
-
-    print("Auction data population finished.")
+        shroff_team.purse = remaining_purse / 100
+        summary.append(f"  {team_abbr}: {assigned} players assigned, spent {total_spent / 100}, purse {remaining_purse / 100}")
+
+    db.add_all(new_entries)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error committing auction data: {e}")
+        return
+
+    # One summary instead of a line per player
+    for line in warnings:
+        print(line)
+    print(f"Auction data populated: {len(missing)} players created, {len(new_entries)} assignments added.")
+    for line in summary:
+        print(line)
 
 # --- Main Execution ---
 
@@ -1,11 +1,14 @@
 """
 JWT token creation and verification.
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +18,13 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "1440"))  # 24 hours default
 
+# Verified payloads by token, so repeated requests with the same token skip decoding.
+# Entries live for at most TOKEN_CACHE_TTL_SECONDS and never past the token's exp.
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -63,8 +73,22 @@ def verify_token(token: str) -> Optional[dict]:
     Returns:
         Decoded payload or None if invalid
     """
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached and cached[0] > now:
+        return dict(cached[1])
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    valid_until = min(now + TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now))
+    with _token_cache_lock:
+        _token_cache[token] = (valid_until, payload)
+        _token_cache.move_to_end(token)
+        # Drop the oldest entries once full
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+    return dict(payload)
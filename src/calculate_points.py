@@ -1,56 +1,94 @@
 import csv
+from bisect import bisect_right
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 import sqlalchemy
 
+# Batting points
+RUN = 1
+BOUNDARY_BONUS = 1
+SIX_BONUS = 2
+THIRTY_RUN_BONUS = 4
+HALF_CENTURY_BONUS = 8
+CENTURY_BONUS = 16
+DUCK = -2
+
+# Bowling points
+WICKET = 25
+STUMPED_BONUS = 6
+LBW_BOWLED_BONUS = 8
+THREE_WICKET_BONUS = 4
+FOUR_WICKET_BONUS = 8
+FIVE_WICKET_BONUS = 16
+MAIDEN_OVER = 12
+
+# Fielding points
+CATCH = 8
+THREE_CATCH_BONUS = 4
+STUMPING = 12
+RUN_OUT_DIRECT = 12           # happens indirectly
+RUN_OUT_INDIRECT = 6
+
+# Bonus to the bowler for each dismissal type
+DISMISSAL_BONUSES = {
+    'bowled': LBW_BOWLED_BONUS,
+    'lbw': LBW_BOWLED_BONUS,
+    'stumped': STUMPED_BONUS,
+    'runout': RUN_OUT_INDIRECT,
+}
+
+# Strike rate points: (low, high, points), first matching tier wins
+SR_TIERS = (
+    (170, float('inf'), 6),
+    (150.01, 170, 4),
+    (130, 150, 2),
+    (60, 70, -2),
+    (50, 59.99, -4),
+    (0, 50, -6)
+)
+
+# Economy rate points
+ECONOMY_TIERS = (
+    (0, 5, 6),
+    (5, 5.99, 4),
+    (6, 7, 2),
+    (10, 11, -2),
+    (11.01, 12, -4),
+    (12, float('inf'), -6)
+)
+
+def _tier_bins(tiers):
+    """
+    Turn (low, high, points) tiers, where the first tier containing a value
+    wins, into sorted bin edges and the points of each bin [edge, next edge).
+    Values in no tier, including the gaps between tiers, fall in 0-point bins.
+    """
+    # Tier membership only changes at a low, or just past a high
+    edges = sorted({-np.inf} | {low for low, _, _ in tiers} | {np.nextafter(high, np.inf) for _, high, _ in tiers})
+    points = [next((pts for low, high, pts in tiers if low <= edge <= high), 0) for edge in edges]
+    return np.array(edges), np.array(points)
+
+def _tier_points(values, bins):
+    """Tier points for a value or an array of values."""
+    edges, points = bins
+    return points[np.searchsorted(edges, values, side='right') - 1]
+
+def _tier_point(value, bins):
+    """Tier points for a single value, from the same bins as plain lists."""
+    edges, points = bins
+    return points[bisect_right(edges, value) - 1]
+
+# (edges, points) bins for one searchsorted lookup instead of scanning the tiers
+SR_BINS = _tier_bins(SR_TIERS)
+ECONOMY_BINS = _tier_bins(ECONOMY_TIERS)
+# The per-player methods bisect lists; NumPy only pays off on whole columns
+SR_BIN_LISTS = tuple(array.tolist() for array in SR_BINS)
+ECONOMY_BIN_LISTS = tuple(array.tolist() for array in ECONOMY_BINS)
+
 class FantasyPointsCalculator:
     def __init__(self):
-        self.point_rules = {
-            # Batting points
-            'run': 1,
-            'boundary_bonus': 1,
-            'six_bonus': 2,
-            '30_run_bonus': 4,
-            'half_century_bonus': 8,
-            'century_bonus': 16,
-            'duck': -2,
-            
-            # Bowling points
-            'wicket': 25,
-            'stumped_bonus':6,
-            'lbw_bowled_bonus': 8,
-            '3_wicket_bonus': 4,
-            '4_wicket_bonus': 8,
-            '5_wicket_bonus': 16,
-            'maiden_over': 12,
-            
-            # Fielding points
-            'catch': 8,
-            '3_catch_bonus': 4,
-            'stumping': 12,
-            'run_out_direct': 12,           # happens indirectly
-            'run_out_indirect': 6,
-            
-            # Strike rate points
-            'strike_rate': [
-                (170, float('inf'), 6),
-                (150.01, 170, 4),
-                (130, 150, 2),
-                (60, 70, -2),
-                (50, 59.99, -4),
-                (0, 50, -6)
-            ],
-            
-            # Economy rate points
-            'economy_rate': [
-                (0, 5, 6),
-                (5, 5.99, 4),
-                (6, 7, 2),
-                (10, 11, -2),
-                (11.01, 12, -4),
-                (12, float('inf'), -6)
-            ]
-        }
         self.bowlers_bonus = {}  # adds "player_name": points to add to this bowlers points
 
     def calculate_batting_points(self, player):
@@ -61,32 +99,29 @@ class FantasyPointsCalculator:
         dismissal_bowler = player.get('dismissal_bowler', '')
         player_name = player.get('player_name', '')
         if (dismissal_type == 'bowled' or dismissal_type == 'lbw'):
-            self.bowlers_bonus[dismissal_bowler] = self.point_rules['lbw_bowled_bonus']
+            self.bowlers_bonus[dismissal_bowler] = LBW_BOWLED_BONUS
         elif dismissal_type == 'stumped':
-            self.bowlers_bonus[dismissal_bowler] = self.point_rules['stumped_bonus']
+            self.bowlers_bonus[dismissal_bowler] = STUMPED_BONUS
         elif dismissal_type == 'runout':
-            self.bowlers_bonus[dismissal_bowler] = self.point_rules['run_out_indirect']
+            self.bowlers_bonus[dismissal_bowler] = RUN_OUT_INDIRECT
         
-        points += runs * self.point_rules['run']
-        points += int(player.get('fours', 0)) * self.point_rules['boundary_bonus']
-        points += int(player.get('sixes', 0)) * self.point_rules['six_bonus']
+        points += runs * RUN
+        points += int(player.get('fours', 0)) * BOUNDARY_BONUS
+        points += int(player.get('sixes', 0)) * SIX_BONUS
         
         if runs >= 100:
-            points += self.point_rules['century_bonus']
+            points += CENTURY_BONUS
         elif runs >= 50:
-            points += self.point_rules['half_century_bonus']
+            points += HALF_CENTURY_BONUS
         elif runs >= 30:
-            points += self.point_rules['30_run_bonus']
+            points += THIRTY_RUN_BONUS
         
         if runs == 0 and int(player.get('dismissals', 0)) > 0:
-            points += self.point_rules['duck']
+            points += DUCK
         
         if balls_faced >= 10:
             sr = float(player.get('strike_rate', 0))
-            for low, high, sr_points in self.point_rules['strike_rate']:
-                if low <= sr <= high:
-                    points += sr_points
-                    break
+            points += _tier_point(sr, SR_BIN_LISTS)
         
         return points
 
@@ -97,21 +132,18 @@ class FantasyPointsCalculator:
         
         
         if wickets >= 5:
-            points += self.point_rules['5_wicket_bonus']
+            points += FIVE_WICKET_BONUS
         elif wickets >= 4:
-            points += self.point_rules['4_wicket_bonus']
+            points += FOUR_WICKET_BONUS
         elif wickets >= 3:
-            points += self.point_rules['3_wicket_bonus']
+            points += THREE_WICKET_BONUS
         
-        points += int(player.get('maidens', 0)) * self.point_rules['maiden_over']
-        points += wickets * self.point_rules['wicket']
+        points += int(player.get('maidens', 0)) * MAIDEN_OVER
+        points += wickets * WICKET
         
         if overs_bowled >= 2:
             economy = float(player.get('economy', 0))
-            for low, high, eco_points in self.point_rules['economy_rate']:
-                if low <= economy <= high:
-                    points += eco_points
-                    break
+            points += _tier_point(economy, ECONOMY_BIN_LISTS)
         
         return points
 
@@ -119,12 +151,12 @@ class FantasyPointsCalculator:
         points = 0
         catches = int(player.get('catches', 0))
         
-        points += catches * self.point_rules['catch']
+        points += catches * CATCH
         if catches >= 3:
-            points += self.point_rules['3_catch_bonus']
+            points += THREE_CATCH_BONUS
         
-        points += int(player.get('stumpings', 0)) * self.point_rules['stumping']
-        points += int(player.get('run_outs', 0)) * self.point_rules['run_out_indirect']
+        points += int(player.get('stumpings', 0)) * STUMPING
+        points += int(player.get('run_outs', 0)) * RUN_OUT_INDIRECT
         
         return points
 
@@ -147,20 +179,91 @@ class FantasyPointsCalculator:
     def calculate_total_points(self, player):
         # if player was in the playing XI, calculate points
         # and if the player was just a substitute i.e. he did not bowl or bat return only fielding points and for all others add 4 points to total points
+        # each component is computed once and reused for the total and the breakdown
+        batting = self.calculate_batting_points(player)
+        bowling = self.calculate_bowling_points(player)
+        fielding = self.calculate_fielding_points(player)
         if self.is_playing_xi(player):
-            points = 4 + self.calculate_batting_points(player) + self.calculate_bowling_points(player) + self.calculate_fielding_points(player)
+            points = 4 + batting + bowling + fielding
         else:
-            points = self.calculate_fielding_points(player)
+            points = fielding
 
         return {
             'player_name': player.get('player_name', ''),
             'team': player.get('team', ''),
             'match_id': player.get('match_id', ''),
             'total_points': points,
-            'batting_points': self.calculate_batting_points(player),
-            'bowling_points': self.calculate_bowling_points(player),
-            'fielding_points': self.calculate_fielding_points(player)
+            'batting_points': batting,
+            'bowling_points': bowling,
+            'fielding_points': fielding
         }
+
+    def calculate_all(self, df):
+        """
+        Points for every row of a stats DataFrame at once, as a DataFrame with
+        the OUTPUT_FIELDNAMES columns. Same rules as calculate_total_points, and
+        bowler dismissal bonuses are recorded in bowlers_bonus the same way.
+        """
+        n = len(df)
+
+        # Points fit easily in int32, half the bytes per pass of int64
+        def column(name, dtype=np.int32):
+            if name not in df:
+                return np.zeros(n, dtype=dtype)
+            return df[name].fillna(0).to_numpy(dtype=dtype)
+
+        runs = column('runs')
+        wickets = column('wickets')
+        catches = column('catches')
+
+        batting = (runs * RUN
+                   + column('fours') * BOUNDARY_BONUS
+                   + column('sixes') * SIX_BONUS)
+        batting += np.select([runs >= 100, runs >= 50, runs >= 30],
+                             [CENTURY_BONUS, HALF_CENTURY_BONUS, THIRTY_RUN_BONUS], 0)
+        batting += np.where((runs == 0) & (column('dismissals') > 0), DUCK, 0)
+        batting += np.where(column('balls_faced') >= 10,
+                            _tier_points(column('strike_rate', np.float64), SR_BINS), 0)
+
+        bowling = wickets * WICKET + column('maidens') * MAIDEN_OVER
+        bowling += np.select([wickets >= 5, wickets >= 4, wickets >= 3],
+                             [FIVE_WICKET_BONUS, FOUR_WICKET_BONUS, THREE_WICKET_BONUS], 0)
+        bowling += np.where(column('overs_bowled', np.float64) >= 2,
+                            _tier_points(column('economy', np.float64), ECONOMY_BINS), 0)
+
+        fielding = (catches * CATCH
+                    + np.where(catches >= 3, THREE_CATCH_BONUS, 0)
+                    + column('stumpings') * STUMPING
+                    + column('run_outs') * RUN_OUT_INDIRECT)
+
+        playing_xi = (column('batting_innings') > 0) | (column('bowling_innings') > 0)
+        total = np.where(playing_xi, 4 + batting + bowling + fielding, fielding)
+
+        if 'dismissal_type' in df and 'dismissal_bowler' in df:
+            bonus = df['dismissal_type'].map(DISMISSAL_BONUSES)
+            # Later dismissals overwrite earlier ones, as in calculate_batting_points
+            self.bowlers_bonus.update(zip(df['dismissal_bowler'][bonus.notna()], bonus.dropna().astype(int)))
+
+        def text(name):
+            return df[name] if name in df else ''
+
+        return pd.DataFrame({
+            'player_name': text('player_name'),
+            'team': text('team'),
+            'match_id': text('match_id'),
+            'total_points': total,
+            'batting_points': batting,
+            'bowling_points': bowling,
+            'fielding_points': fielding,
+        }, index=df.index)
+
+    def calculate_players(self, players):
+        """
+        calculate_total_points for a list of player dicts, building the arrays
+        once and scoring them together with calculate_all.
+        """
+        return self.calculate_all(pd.DataFrame.from_records(players)).to_dict('records')
+
     def get_bowlers_fielders_bonus(self, player):
         """Get bonus points for bowler/fielder from dismissal records."""
         player_name = player.get('player_name', '')
@@ -172,13 +275,16 @@ def process_input_file(input_file):
     with open(input_file, mode='r', encoding='utf-8') as csvfile:
         return list(csv.DictReader(csvfile))
 
+OUTPUT_FIELDNAMES = ('player_name', 'team', 'match_id', 'total_points', 'batting_points', 'bowling_points', 'fielding_points')
+
 def save_output_file(players_points, output_file):
-    fieldnames = ['player_name', 'team', 'match_id', 'total_points', 'batting_points', 'bowling_points', 'fielding_points']
-    
-    with open(output_file, mode='w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(players_points)
+    # plain csv.writer over precomputed tuples with a 1 MiB buffer to batch write syscalls
+    with open(output_file, mode='w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(OUTPUT_FIELDNAMES)
+        writer.writerows(
+            tuple(p.get(field, '') for field in OUTPUT_FIELDNAMES) for p in players_points
+        )
 
 def main():
     # fetch from the circdata.db and recalculate points from the db data only 
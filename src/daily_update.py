@@ -34,7 +34,7 @@ load_dotenv()
 # Import required modules
 try:
     from database import SessionLocal, Match, Player, Shroff_teams, TeamPlayer
-    from ppdb import fetch_match_data, process_match_data, populate_database, df
+    from ppdb import fetch_match_data, fetch_matches_data, process_match_data, populate_database, df_by_date
     from auction_manager import populate_auction_data
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
@@ -46,13 +46,27 @@ def get_yesterdays_match():
     yesterday = datetime.now().date() - timedelta(days=1)
     logger.info(f"Looking for matches played on {yesterday}")
     
-    matches = df[df["date"] == yesterday][["id", "date"]].to_dict('records')
+    # Slice of the date-sorted index: a binary search, and empty if no match that day
+    matches = df_by_date.loc[yesterday:yesterday, ["id", "date"]].to_dict('records')
     logger.info(f"Found {len(matches)} matches for {yesterday}")
     return matches
 
 
-def process_match(match_id):
-    """Process a single match and update the database"""
+def get_new_match_ids(match_ids):
+    """The given match ids that are not in the database yet, in one query"""
+    db = SessionLocal()
+    try:
+        existing = {
+            match_id for (match_id,) in
+            db.query(Match.match_id).filter(Match.match_id.in_(match_ids))
+        }
+        return [match_id for match_id in match_ids if match_id not in existing]
+    finally:
+        db.close()
+
+
+def process_match(match_id, match_data=None):
+    """Process a single match and update the database (match_data if already fetched)"""
     logger.info(f"Processing match ID: {match_id}")
     
     # Check if match already exists in database
@@ -64,7 +78,8 @@ def process_match(match_id):
             return False
             
         # Fetch match data
-        match_data = fetch_match_data(match_id)
+        if match_data is None:
+            match_data = fetch_match_data(match_id)
         if match_data.get("status") == "error":
             logger.error(f"Error fetching match {match_id}: {match_data.get('message')}")
             return False
@@ -157,16 +172,17 @@ def run_daily_update():
     matches = get_yesterdays_match()
     processed = 0
     
+    # Scorecards of new matches are fetched concurrently up front (bounded by
+    # ppdb.MAX_CONCURRENT_FETCHES); the database writes stay one match at a time
+    scorecards = fetch_matches_data(get_new_match_ids([str(match['id']) for match in matches]))
+    
     for match in matches:
         match_id = str(match['id'])
         match_date = match['date']
         logger.info(f"Processing match {match_id} from {match_date}")
         
-        if process_match(match_id):
+        if process_match(match_id, scorecards.get(match_id)):
             processed += 1
-            # Add a small delay between API calls
-            if len(matches) > 1:
-                time.sleep(2)
     
     # Complete
     elapsed_time = time.time() - start_time
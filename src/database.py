@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import create_engine, event, inspect, Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index, select, delete, insert, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -16,12 +16,37 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
     )
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        # WAL: readers don't block the writer and commits skip the second fsync;
+        # plus a 64 MiB page cache and 256 MiB of memory-mapped reads
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 else:
     # For PostgreSQL, MySQL, etc.
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for read-only endpoints: nothing is flushed and loaded objects stay usable after commit
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_read_session_flush(session, flush_context, instances):
+    raise RuntimeError("Read-only session cannot write")
+
+@event.listens_for(ReadSessionLocal, "do_orm_execute")
+def _reject_read_session_dml(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise RuntimeError("Read-only session cannot write")
+
 Base = declarative_base()
 
 class Player(Base):
@@ -72,10 +97,20 @@ class Match(Base):
 
 class MatchStats(Base):
     __tablename__ = "match_stats"
+    __table_args__ = (
+        # Covers the per-player aggregation so Postgres can answer it with an index-only scan
+        Index(
+            "idx_matchstats_player_match_covering", "player_id", "match_id",
+            postgresql_include=[
+                "runs", "wickets", "catches", "stumpings", "run_outs",
+                "total_points", "batting_points", "bowling_points", "fielding_points"
+            ]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"))
-    match_id = Column(Integer, ForeignKey("matches.id"))
+    match_id = Column(Integer, ForeignKey("matches.id"), index=True)
     
     # Match-specific statistics
     player_name = Column(String)
@@ -113,6 +148,29 @@ class MatchStats(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class PlayerMatchTotals(Base):
+    """Running totals of a player's match_stats up to and including match_id.
+
+    Totals over a tenure [joined_at_match, left_at_match) are the difference of two rows,
+    so the team stats endpoints never have to scan match_stats.
+    Rebuilt by refresh_player_match_totals whenever match_stats is written.
+    """
+    __tablename__ = "player_match_totals"
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), primary_key=True)
+
+    matches = Column(Integer, default=0)
+    runs = Column(Integer, default=0)
+    wickets = Column(Integer, default=0)
+    catches = Column(Integer, default=0)
+    stumpings = Column(Integer, default=0)
+    run_outs = Column(Integer, default=0)
+    total_points = Column(Float, default=0)
+    batting_points = Column(Float, default=0)
+    bowling_points = Column(Float, default=0)
+    fielding_points = Column(Float, default=0)
+
 class Shroff_teams(Base):
     __tablename__ = "shroff_teams"
 
@@ -132,6 +190,16 @@ class Shroff_teams(Base):
 # New classes for auction and team management
 class TeamPlayer(Base):
     __tablename__ = "team_players"
+    __table_args__ = (
+        # Active-roster lookups filter on team_id/player_id with left_at_match IS NULL
+        Index("ix_teamplayer_team_active", "team_id", "left_at_match", "player_id"),
+        Index("ix_teamplayer_player_active", "player_id", "left_at_match"),
+        Index(
+            "ix_teamplayer_team_active_null", "team_id", "player_id",
+            postgresql_where=text("left_at_match IS NULL"),
+            sqlite_where=text("left_at_match IS NULL")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("shroff_teams.id"))
@@ -173,8 +241,74 @@ class PlayerTransfer(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+def _create_schema():
+    # One inspection on import; the DDL checks only run when something is missing
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    if not existing_tables.issuperset(Base.metadata.tables):
+        Base.metadata.create_all(bind=engine)
+    # create_all skips indexes on tables that already exist
+    added_indexes = False
+    for table in (MatchStats.__table__, TeamPlayer.__table__):
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=engine, checkfirst=True)
+                added_indexes = True
+    # Refresh planner statistics so populated tables start using the new indexes
+    if added_indexes:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
 # Create all tables
-Base.metadata.create_all(bind=engine)
+_create_schema()
+
+# match_stats columns that are summed into player_match_totals
+PLAYER_MATCH_TOTAL_COLUMNS = (
+    "runs", "wickets", "catches", "stumpings", "run_outs",
+    "total_points", "batting_points", "bowling_points", "fielding_points"
+)
+
+def refresh_player_match_totals(db, player_ids=None):
+    """Rebuild the running totals for the given players (all players if None) and commit"""
+    per_match = select(
+        MatchStats.player_id,
+        MatchStats.match_id,
+        func.count(MatchStats.id).label("matches"),
+        *[func.sum(getattr(MatchStats, col)).label(col) for col in PLAYER_MATCH_TOTAL_COLUMNS]
+    ).group_by(MatchStats.player_id, MatchStats.match_id)
+    stale_rows = delete(PlayerMatchTotals)
+    if player_ids is not None:
+        player_ids = list(player_ids)
+        if not player_ids:
+            return
+        per_match = per_match.where(MatchStats.player_id.in_(player_ids))
+        stale_rows = stale_rows.where(PlayerMatchTotals.player_id.in_(player_ids))
+    per_match = per_match.subquery()
+
+    # (player_id, match_id) is unique per row here, so the default window frame is a running sum
+    running_columns = ("matches",) + PLAYER_MATCH_TOTAL_COLUMNS
+    running_totals = select(
+        per_match.c.player_id,
+        per_match.c.match_id,
+        *[
+            func.sum(per_match.c[col]).over(partition_by=per_match.c.player_id, order_by=per_match.c.match_id)
+            for col in running_columns
+        ]
+    )
+    db.execute(stale_rows)
+    db.execute(insert(PlayerMatchTotals).from_select(["player_id", "match_id", *running_columns], running_totals))
+    db.commit()
+
+def _backfill_player_match_totals():
+    # Databases populated before player_match_totals existed get it built once
+    with SessionLocal() as db:
+        if db.query(PlayerMatchTotals.player_id).first() is None and db.query(MatchStats.id).first() is not None:
+            refresh_player_match_totals(db)
+
+_backfill_player_match_totals()
 
 # Dependency
 def get_db():
@@ -182,4 +316,14 @@ def get_db():
     try:
         yield db
     finally:
+        db.close()
+
+# Dependency for read-only endpoints
+def get_readonly_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        # Never commit: the read transaction is always discarded
+        db.rollback()
         db.close()
\ No newline at end of file
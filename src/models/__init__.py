@@ -3,4 +3,4 @@ from .base import Base, engine, SessionLocal, get_db
 from .user import User
 from .player import Player, Match, MatchStats
 from .team import Team, TeamPlayer, PlayerTransfer
-from .auction import AuctionEvent, AuctionPlayer, AuctionBid, AuctionTeamAuth
+from .auction import AuctionEvent, AuctionPlayer, AuctionPlayerStatus, AuctionBid, AuctionTeamAuth
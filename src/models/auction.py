@@ -1,12 +1,44 @@
 """
 Auction models for managing live auction events.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from enum import IntEnum
+from typing import Optional
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from .base import Base
 
 
+class AuctionPlayerStatus(IntEnum):
+    """Status of a player in an auction pool, stored as a SMALLINT."""
+    AVAILABLE = 0
+    CURRENT = 1
+    SOLD = 2
+    UNSOLD = 3
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+    
+    @classmethod
+    def from_label(cls, label: str) -> Optional["AuctionPlayerStatus"]:
+        """Map "available"/"current"/"sold"/"unsold" to a status (None if unknown)."""
+        return cls.__members__.get(label.upper())
+
+
+class AuctionPlayerStatusType(TypeDecorator):
+    """Stores AuctionPlayerStatus values as SMALLINT."""
+    impl = SmallInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(value)
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else AuctionPlayerStatus(value)
+
+
 class AuctionEvent(Base):
     """
     A live auction event.
@@ -48,12 +80,17 @@ class AuctionEvent(Base):
     current_player_id = Column(Integer, nullable=True)  # Player being auctioned
     current_bid = Column(Float, nullable=True)
     current_bid_team_id = Column(Integer, nullable=True)
+    current_bid_id = Column(
+        Integer,
+        ForeignKey("auction_bids.id", use_alter=True, name="fk_auction_events_current_bid"),
+        nullable=True
+    )
     
     # Relationships
     owner = relationship("User")
     teams = relationship("Team", backref="auction")
     players = relationship("AuctionPlayer", back_populates="auction")
-    bids = relationship("AuctionBid", back_populates="auction")
+    bids = relationship("AuctionBid", back_populates="auction", foreign_keys="AuctionBid.auction_id")
     authorized_users = relationship("AuctionTeamAuth", back_populates="auction")
     
     # Timestamps
@@ -75,6 +112,10 @@ class AuctionPlayer(Base):
     For community: Uses custom_name
     """
     __tablename__ = "auction_players"
+    __table_args__ = (
+        # Per-status pool counts for auction state broadcasts
+        Index("ix_auctionplayer_auction_status_code", "auction_id", "status_code"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     auction_id = Column(Integer, ForeignKey("auction_events.id"), nullable=False)
@@ -89,7 +130,12 @@ class AuctionPlayer(Base):
     sold_to_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     
     # Status: available, current, sold, unsold
-    status = Column(String, default="available")
+    status_code = Column(
+        AuctionPlayerStatusType,
+        default=AuctionPlayerStatus.AVAILABLE,
+        server_default="0",
+        nullable=False
+    )
     
     # Order in auction pool
     pool_order = Column(Integer, default=0)
@@ -107,6 +153,16 @@ class AuctionPlayer(Base):
         if self.player:
             return self.player.player_name
         return self.custom_name or "Unknown Player"
+    
+    @property
+    def status(self) -> str:
+        """Status label, as exposed by the API."""
+        # Rows not flushed yet have no status_code; the column default is available
+        return AuctionPlayerStatus(self.status_code or AuctionPlayerStatus.AVAILABLE).label
+    
+    @status.setter
+    def status(self, label: str):
+        self.status_code = AuctionPlayerStatus[label.upper()]
 
 
 class AuctionBid(Base):
@@ -122,7 +178,7 @@ class AuctionBid(Base):
     is_winning_bid = Column(Boolean, default=False)
     
     # Relationships
-    auction = relationship("AuctionEvent", back_populates="bids")
+    auction = relationship("AuctionEvent", back_populates="bids", foreign_keys=[auction_id])
     auction_player = relationship("AuctionPlayer")
     team = relationship("Team")
     
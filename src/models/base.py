@@ -1,7 +1,7 @@
 """
 Database configuration and base model.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -27,13 +27,25 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
         SQLALCHEMY_DATABASE_URL, 
         connect_args={"check_same_thread": False}
     )
+    
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        """Same connection settings as the legacy engine in database.py (WAL etc.)."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 else:
-    # For PostgreSQL - use connection pooling
+    # For PostgreSQL - use connection pooling, sized for WebSocket connect storms
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True
+        pool_size=int(os.getenv("DB_POOL_SIZE", 20)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_pre_ping=True,
+        pool_recycle=3600
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -49,8 +61,42 @@ def get_db():
         db.close()
 
 
+def _add_missing_column(table: str, column: str, column_ddl: str, backfill_sql: str = None):
+    """Add a column that create_all cannot add to an already existing table."""
+    with engine.begin() as conn:
+        if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+            return
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column_ddl}"))
+        if backfill_sql:
+            conn.execute(text(backfill_sql))
+
+
 def init_db():
     """Initialize all database tables."""
     # Import all models to ensure they're registered
     from . import user, player, team, auction  # noqa
     Base.metadata.create_all(bind=engine)
+    # Pool status moved from a varchar to a SMALLINT code; backfill existing rows
+    status_cases = " ".join(
+        f"WHEN '{status.label}' THEN {status.value}" for status in auction.AuctionPlayerStatus
+    )
+    _add_missing_column(
+        "auction_players", "status_code", "status_code SMALLINT NOT NULL DEFAULT 0",
+        f"UPDATE auction_players SET status_code = CASE status {status_cases} ELSE 0 END"
+    )
+    _add_missing_column(
+        "auction_events", "current_bid_id", "current_bid_id INTEGER REFERENCES auction_bids(id)"
+    )
+    # create_all skips indexes on tables that already exist
+    inspector = inspect(engine)
+    added_indexes = False
+    for table in (player.MatchStats.__table__, team.TeamPlayer.__table__, auction.AuctionPlayer.__table__):
+        existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=engine, checkfirst=True)
+                added_indexes = True
+    # Refresh planner statistics so populated tables start using the new indexes
+    if added_indexes:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
@@ -2,7 +2,7 @@
 Player and match statistics models.
 Migrated from original database.py with improvements.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base
@@ -77,10 +77,20 @@ class Match(Base):
 class MatchStats(Base):
     """Player statistics for a specific match."""
     __tablename__ = "match_stats"
+    __table_args__ = (
+        # Covers the per-player aggregation so Postgres can answer it with an index-only scan
+        Index(
+            "idx_matchstats_player_match_covering", "player_id", "match_id",
+            postgresql_include=[
+                "runs", "wickets", "catches", "stumpings", "run_outs",
+                "total_points", "batting_points", "bowling_points", "fielding_points"
+            ]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"))
-    match_id = Column(Integer, ForeignKey("matches.id"))
+    match_id = Column(Integer, ForeignKey("matches.id"), index=True)
     
     # Match-specific statistics
     player_name = Column(String)  # Denormalized for quick access
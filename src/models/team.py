@@ -1,7 +1,7 @@
 """
 Team models for auction team management.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base
@@ -52,6 +52,16 @@ class TeamPlayer(Base):
     Tracks player tenure with a team (when joined/left).
     """
     __tablename__ = "team_players"
+    __table_args__ = (
+        # Active-roster lookups filter on team_id/player_id with left_at_match IS NULL
+        Index("ix_teamplayer_team_active", "team_id", "left_at_match", "player_id"),
+        Index("ix_teamplayer_player_active", "player_id", "left_at_match"),
+        Index(
+            "ix_teamplayer_team_active_null", "team_id", "player_id",
+            postgresql_where=text("left_at_match IS NULL"),
+            sqlite_where=text("left_at_match IS NULL")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
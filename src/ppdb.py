@@ -3,10 +3,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 from collections import defaultdict
 from fastapi import FastAPI , Depends, HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from database import Base, Player, Match, MatchStats, PlayerTransfer, Shroff_teams, TeamPlayer, get_db, engine
-from calculate_points import FantasyPointsCalculator
-import os,json,requests
+from database import Base, Player, Match, MatchStats, PlayerTransfer, Shroff_teams, TeamPlayer, get_db, engine, refresh_player_match_totals
+from calculate_points import FantasyPointsCalculator, DISMISSAL_BONUSES
+import os,json,requests,threading,asyncio
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -22,6 +26,30 @@ project_root = Path(__file__).parent.parent
 match_data_path = project_root / "Match_data.csv"
 df = pd.read_csv(match_data_path)
 df["date"] = pd.to_datetime(df["date"]).dt.date  # Convert to date-only format
+# Same rows indexed by sorted date (CSV order kept within a day), so date
+# lookups are a binary search on the index instead of a full-column scan
+df_by_date = df.set_index("date", drop=False).rename_axis(None).sort_index(kind="stable")
+
+# Shared HTTP session so repeated scorecard fetches reuse the same TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+# Auth params are set once on the clients; each call only adds the match id
+_AUTH_PARAMS = {"apikey": API_KEY, "offset": 0}
+_SESSION.params = dict(_AUTH_PARAMS)
+
+# In-process scorecard cache: match_id -> (expires_at, response)
+# Finished matches never change upstream, so they are kept much longer
+SCORECARD_CACHE_TTL = 300
+FINISHED_SCORECARD_CACHE_TTL = 24 * 60 * 60
+SCORECARD_CACHE_MAXSIZE = 1024
+# Scorecard requests in flight at once in fetch_matches_data, to respect API rate limits
+MAX_CONCURRENT_FETCHES = 5
+_scorecard_cache: Dict[str, tuple] = {}
+_scorecard_cache_lock = threading.Lock()
 
 class PlayerResponse(BaseModel):
     id: int
@@ -42,27 +70,91 @@ class TeamResponse(BaseModel):
     purse_remaining: float
 
 
+def _get_cached_scorecard(match_id: str, now: float) -> Optional[dict]:
+    with _scorecard_cache_lock:
+        cached = _scorecard_cache.get(match_id)
+        if cached and cached[0] > now:
+            return cached[1]
+    return None
+
+def _cache_scorecard(match_id: str, result: dict, now: float):
+    # Only successful responses are cached
+    if result.get("status") != "success":
+        return
+    finished = bool(result.get("data", {}).get("matchEnded"))
+    ttl = FINISHED_SCORECARD_CACHE_TTL if finished else SCORECARD_CACHE_TTL
+    with _scorecard_cache_lock:
+        if match_id not in _scorecard_cache and len(_scorecard_cache) >= SCORECARD_CACHE_MAXSIZE:
+            # Evict the oldest entry
+            _scorecard_cache.pop(next(iter(_scorecard_cache)))
+        _scorecard_cache[match_id] = (now + ttl, result)
+
 #fetch based on match_id from get_completed_matches
 def fetch_match_data(match_id: str) -> dict:
-    """Fetch match data from CricData API"""
+    """Fetch match data from CricData API (cached per match_id)"""
+    now = time.monotonic()
+    cached = _get_cached_scorecard(match_id, now)
+    if cached is not None:
+        return cached
+
     try:
         url = f"{BASE_URL}/match_scorecard"
-        params = {"apikey": API_KEY, "offset": 0,"id": match_id}
-        response = requests.get(url, params=params, timeout=10)
-        return response.json()
+        response = _SESSION.get(url, params={"id": match_id}, timeout=(3.05, 10))
+        result = response.json()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching match data for {match_id}: {str(e)}")
         return {"status": "error", "message": str(e)}
+
+    _cache_scorecard(match_id, result, now)
+    return result
+
+async def _fetch_match_data_async(client: httpx.AsyncClient, match_id: str) -> dict:
+    """Async counterpart of fetch_match_data sharing the same scorecard cache"""
+    now = time.monotonic()
+    cached = _get_cached_scorecard(match_id, now)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await client.get(f"{BASE_URL}/match_scorecard", params={"id": match_id})
+        result = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching match data for {match_id}: {str(e)}")
+        return {"status": "error", "message": str(e)}
+
+    _cache_scorecard(match_id, result, now)
+    return result
+
+async def _fetch_matches_data_async(match_ids: List[str]) -> Dict[str, dict]:
+    async with httpx.AsyncClient(
+        params=_AUTH_PARAMS,
+        timeout=httpx.Timeout(10, connect=3.05),
+        limits=httpx.Limits(max_keepalive_connections=8)
+    ) as client:
+        slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(match_id: str) -> dict:
+            async with slots:
+                return await _fetch_match_data_async(client, match_id)
+
+        results = await asyncio.gather(*(fetch(mid) for mid in match_ids))
+    return dict(zip(match_ids, results))
+
+def fetch_matches_data(match_ids: List[str]) -> Dict[str, dict]:
+    """Fetch several scorecards concurrently over one client, keyed by match_id"""
+    if not match_ids:
+        return {}
+    return asyncio.run(_fetch_matches_data_async(match_ids))
 #yesterday tak
 def get_completed_matches():
     yesterday = datetime.now().date() - timedelta(days=1)
     # today = datetime.now().date()
-    return df[df["date"] <= yesterday][["id", "date"]].to_dict('records')
+    return df_by_date.loc[:yesterday, ["id", "date"]].to_dict('records')
 
 def get_yesterdays_match():
     """Get match data for yesterday's date from Match_data.csv"""
     yesterday = datetime.now().date() - timedelta(days=1)
-    matches = df[df["date"] == yesterday][["id", "date"]].to_dict('records')
+    matches = df_by_date.loc[yesterday:yesterday, ["id", "date"]].to_dict('records')
     print(f"Found {len(matches)} matches for {yesterday}")
     return matches
 
@@ -73,7 +165,7 @@ def get_10_matches():
 #aaj ka match
 def todays_match(match_id):
     today = datetime.now().date()
-    return df[df["date"] == today][["id","date"]].to_dict('records')
+    return df_by_date.loc[today:today, ["id","date"]].to_dict('records')
 #called in pop_db for player_stats
 def process_match_data(match_data):
     player_stats = defaultdict(lambda: {
@@ -233,9 +325,20 @@ def populate_database(input_result):
             print("Initialized Shroff teams")
 
         # Process each player's stats
-        for player_id, stats in player_stats.items():
+        updated_player_ids = set()
+        # MatchStats rows, inserted together after the loop
+        stats_rows = []
+        # All of this match's players in one query (first row wins for duplicate names)
+        players_by_name = {}
+        for player in db.query(Player).filter(
+            Player.player_name.in_({stats['player_name'] for stats in player_stats.values()})
+        ).order_by(Player.id):
+            players_by_name.setdefault(player.player_name, player)
+        # Score the whole match in one pass over the stats columns
+        match_points = FantasyPointsCalculator().calculate_players(list(player_stats.values()))
+        for stats, fantasy_points in zip(player_stats.values(), match_points):
             # Find or create Player
-            player = db.query(Player).filter(Player.player_name == stats['player_name']).first()
+            player = players_by_name.get(stats['player_name'])
             if not player:
                 player = Player(
                     player_name=stats['player_name'],
@@ -255,16 +358,18 @@ def populate_database(input_result):
                     total_fantasy_points=0
                 )
                 db.add(player)
-                db.commit()
+                # Flush for the id; everything is committed together below
+                db.flush()
+                players_by_name[player.player_name] = player
                 print(f"Created new player: {player.player_name}")
 
             # Create MatchStats record
-            calculator = FantasyPointsCalculator()
-            fantasy_points = calculator.calculate_total_points(stats)
-            if stats['player_name'] in calculator.bowlers_bonus:
-                fantasy_points['bowling_points'] += calculator.bowlers_bonus[stats['player_name']]     #adding the bonus of getting players out on stumping/bowled/lbw etc.
-                fantasy_points['total_points'] += calculator.bowlers_bonus[stats['player_name']]       #to make sure total is also updated since total is calculated inside the calculator only 
-            match_stats = MatchStats(
+            # Dismissal bonuses are kept per player: one recorded against the player's own name is added to their points
+            bonus = DISMISSAL_BONUSES.get(stats['dismissal_type'], 0) if stats['dismissal_bowler'] == stats['player_name'] else 0
+            if bonus:
+                fantasy_points['bowling_points'] += bonus     #adding the bonus of getting players out on stumping/bowled/lbw etc.
+                fantasy_points['total_points'] += bonus       #to make sure total is also updated since total is calculated inside the calculator only 
+            stats_rows.append(dict(
                 player_id=player.id,
                 match_id=new_match.id,
                 player_name = stats['player_name'],
@@ -290,8 +395,8 @@ def populate_database(input_result):
                 batting_points=fantasy_points['batting_points'],
                 bowling_points=fantasy_points['bowling_points'],
                 fielding_points=fantasy_points['fielding_points']
-            )
-            db.add(match_stats)
+            ))
+            updated_player_ids.add(player.id)
 
             # Update player career stats
             player.matches_played += 1
@@ -308,7 +413,12 @@ def populate_database(input_result):
             player.total_run_outs += stats['run_outs']
             player.total_fantasy_points += fantasy_points['total_points']
 
+        # One multi-row INSERT instead of an ORM flush per player
+        if stats_rows:
+            db.execute(insert(MatchStats), stats_rows)
         db.commit()
+        # Keep the running totals used by the team stats endpoints in step with match_stats
+        refresh_player_match_totals(db, updated_player_ids)
         print("\nSuccessfully updated database with match data")
 
         # Verification: Print example records
@@ -341,6 +451,9 @@ def full_populate_till_date():
     try:
         completed_matches = get_10_matches()
         print(f"Found {len(completed_matches)} completed matches to process")
+
+        # Fetch all scorecards from the API concurrently up front
+        scorecards = fetch_matches_data([str(match['id']) for match in completed_matches])
         
         for match in completed_matches:
             try:
@@ -348,8 +461,7 @@ def full_populate_till_date():
                 match_date = match['date'].strftime('%Y-%m-%d')
                 print(f"\nProcessing match {match_id} from {match_date}")
                 
-                # Fetch match data from API
-                match_data = fetch_match_data(match_id)
+                match_data = scorecards[match_id]
                 
                 if match_data.get("status") == "error":
                     print(f"Error fetching match {match_id}: {match_data.get('message')}")
@@ -361,8 +473,6 @@ def full_populate_till_date():
                     print("Stopping due to processing error")
                     return False  # Stop on processing error
                 
-                time.sleep(1)
-                
             except Exception as e:
                 print(f"Error processing match {match_id}: {str(e)}")
                 return False  # Stop on any exception
@@ -32,7 +32,7 @@ class UserInfo(BaseModel):
 
 
 @router.get("/users")
-async def list_users(
+def list_users(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -51,7 +51,7 @@ async def list_users(
 
 
 @router.post("/users/role")
-async def update_user_role(
+def update_user_role(
     data: UpdateRoleRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
@@ -84,7 +84,7 @@ async def update_user_role(
 
 
 @router.post("/promote-self")
-async def promote_self_to_admin(
+def promote_self_to_admin(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
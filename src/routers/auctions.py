@@ -9,8 +9,9 @@ from datetime import datetime
 
 from models.base import get_db
 from models.user import User
-from models.auction import AuctionEvent, AuctionPlayer, AuctionTeamAuth
+from models.auction import AuctionEvent, AuctionPlayer, AuctionPlayerStatus, AuctionTeamAuth
 from models.team import Team
+from auction.websocket import manager as connection_manager
 from auth.dependencies import get_current_active_user, require_admin, require_manager
 
 router = APIRouter(prefix="/auctions", tags=["Auctions"])
@@ -83,7 +84,7 @@ class PlayerPoolItem(BaseModel):
 # --- Endpoints ---
 
 @router.get("/", response_model=List[AuctionListResponse])
-async def list_auctions(
+def list_auctions(
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_active_user)
 ):
@@ -108,7 +109,7 @@ async def list_auctions(
 
 
 @router.post("/", response_model=AuctionResponse, status_code=status.HTTP_201_CREATED)
-async def create_auction(
+def create_auction(
     auction_data: AuctionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -135,7 +136,7 @@ async def create_auction(
 
 
 @router.get("/{auction_id}", response_model=AuctionResponse)
-async def get_auction(
+def get_auction(
     auction_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -159,7 +160,7 @@ async def get_auction(
 
 
 @router.patch("/{auction_id}", response_model=AuctionResponse)
-async def update_auction(
+def update_auction(
     auction_id: int,
     auction_data: AuctionUpdate,
     db: Session = Depends(get_db),
@@ -188,7 +189,7 @@ async def update_auction(
 
 
 @router.post("/{auction_id}/authorize", status_code=status.HTTP_201_CREATED)
-async def authorize_user(
+def authorize_user(
     auction_id: int,
     auth_data: AuthorizeUserRequest,
     db: Session = Depends(get_db),
@@ -235,7 +236,7 @@ async def authorize_user(
 
 
 @router.post("/{auction_id}/players", status_code=status.HTTP_201_CREATED)
-async def add_player_to_pool(
+def add_player_to_pool(
     auction_id: int,
     player_data: PlayerPoolItem,
     db: Session = Depends(get_db),
@@ -281,6 +282,7 @@ async def add_player_to_pool(
     db.add(auction_player)
     db.commit()
     db.refresh(auction_player)
+    connection_manager.invalidate_state(auction_id)
     
     return {
         "id": auction_player.id,
@@ -291,7 +293,7 @@ async def add_player_to_pool(
 
 
 @router.get("/{auction_id}/players")
-async def get_player_pool(
+def get_player_pool(
     auction_id: int,
     status_filter: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -305,7 +307,8 @@ async def get_player_pool(
     query = db.query(AuctionPlayer).filter(AuctionPlayer.auction_id == auction_id)
     
     if status_filter:
-        query = query.filter(AuctionPlayer.status == status_filter)
+        # Unknown statuses match no rows
+        query = query.filter(AuctionPlayer.status_code == AuctionPlayerStatus.from_label(status_filter))
     
     players = query.order_by(AuctionPlayer.pool_order).all()
     
@@ -323,7 +326,7 @@ async def get_player_pool(
 
 
 @router.post("/{auction_id}/start")
-async def start_auction(
+def start_auction(
     auction_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_manager)
@@ -357,7 +360,7 @@ async def start_auction(
 
 
 @router.post("/{auction_id}/pause")
-async def pause_auction(
+def pause_auction(
     auction_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_manager)
@@ -380,7 +383,7 @@ async def pause_auction(
 
 
 @router.post("/{auction_id}/complete")
-async def complete_auction(
+def complete_auction(
     auction_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_manager)
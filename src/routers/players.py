@@ -41,7 +41,7 @@ class PlayerSearchResult(BaseModel):
 # --- Endpoints ---
 
 @router.get("/search", response_model=List[PlayerSearchResult])
-async def search_players(
+def search_players(
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(default=20, le=50),
     db: Session = Depends(get_db),
@@ -130,7 +130,7 @@ async def search_players(
 
 
 @router.get("/{player_id}", response_model=PlayerSearchResult)
-async def get_player(
+def get_player(
     player_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -154,7 +154,7 @@ async def get_player(
 
 
 @router.post("/{player_id}/alias")
-async def add_player_alias(
+def add_player_alias(
     player_id: int,
     alias: str = Query(..., min_length=2),
     db: Session = Depends(get_db),
@@ -11,6 +11,7 @@ from models.base import get_db
 from models.user import User
 from models.team import Team, TeamPlayer
 from models.auction import AuctionEvent, AuctionTeamAuth, AuctionPlayer
+from auction.websocket import manager as connection_manager
 from auth.dependencies import get_current_active_user, require_manager
 
 router = APIRouter(prefix="/auctions/{auction_id}/teams", tags=["Teams"])
@@ -64,7 +65,7 @@ class TeamDetailResponse(TeamResponse):
 # --- Endpoints ---
 
 @router.get("/", response_model=List[TeamResponse])
-async def list_teams(
+def list_teams(
     auction_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -80,7 +81,7 @@ async def list_teams(
 
 
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
-async def create_team(
+def create_team(
     auction_id: int,
     team_data: TeamCreate,
     db: Session = Depends(get_db),
@@ -134,6 +135,7 @@ async def create_team(
     db.add(team)
     db.commit()
     db.refresh(team)
+    connection_manager.invalidate_teams(auction_id)
     
     # Update authorization record if exists
     auth = db.query(AuctionTeamAuth).filter(
@@ -148,7 +150,7 @@ async def create_team(
 
 
 @router.get("/{team_id}", response_model=TeamDetailResponse)
-async def get_team(
+def get_team(
     auction_id: int,
     team_id: int,
     db: Session = Depends(get_db),
@@ -194,7 +196,7 @@ async def get_team(
 
 
 @router.patch("/{team_id}", response_model=TeamResponse)
-async def update_team(
+def update_team(
     auction_id: int,
     team_id: int,
     team_data: TeamUpdate,
@@ -232,11 +234,12 @@ async def update_team(
     
     db.commit()
     db.refresh(team)
+    connection_manager.invalidate_teams(auction_id)
     return team
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_team(
+def delete_team(
     auction_id: int,
     team_id: int,
     db: Session = Depends(get_db),
@@ -265,11 +268,12 @@ async def delete_team(
     
     db.delete(team)
     db.commit()
+    connection_manager.invalidate_teams(auction_id)
     return None
 
 
 @router.post("/{team_id}/captain/{player_id}")
-async def set_captain(
+def set_captain(
     auction_id: int,
     team_id: int,
     player_id: int,
@@ -299,20 +303,24 @@ async def set_captain(
     if not team_player:
         raise HTTPException(status_code=404, detail="Player not found in team")
     
+    # The bulk updates below skip syncing the session; team_player is left out
+    # of them so its in-memory flags stay accurate
     if is_vice:
         # Remove existing vice captain
         db.query(TeamPlayer).filter(
             TeamPlayer.team_id == team_id,
-            TeamPlayer.is_vice_captain == True
-        ).update({"is_vice_captain": False})
+            TeamPlayer.is_vice_captain == True,
+            TeamPlayer.id != team_player.id
+        ).update({"is_vice_captain": False}, synchronize_session=False)
         team_player.is_vice_captain = True
         team_player.is_captain = False
     else:
         # Remove existing captain
         db.query(TeamPlayer).filter(
             TeamPlayer.team_id == team_id,
-            TeamPlayer.is_captain == True
-        ).update({"is_captain": False})
+            TeamPlayer.is_captain == True,
+            TeamPlayer.id != team_player.id
+        ).update({"is_captain": False}, synchronize_session=False)
         team_player.is_captain = True
         team_player.is_vice_captain = False
     
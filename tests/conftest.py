@@ -72,6 +72,65 @@ def sample_dismissal_lbw():
     }
 
 
+@pytest.fixture
+def auction_session():
+    """Session on a fresh in-memory SQLite database with the app schema."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    import models  # noqa: registers every table on Base
+    from models.base import Base
+    
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def make_live_auction(auction_session):
+    """
+    Factory for a live auction with two teams (purse 100) and a player on the
+    block at base price 1.0. Returns the ids as a dict.
+    """
+    from models import User, AuctionEvent, AuctionPlayer, AuctionPlayerStatus, Team
+    
+    def make(bid_increment_tiers=None):
+        owner = User(email=f"owner{id(object())}@test.com", hashed_password="x", display_name="Owner")
+        auction_session.add(owner)
+        auction_session.flush()
+        auction = AuctionEvent(
+            name="Test Auction", status="live", owner_id=owner.id,
+            bid_increment_tiers=bid_increment_tiers
+        )
+        auction_session.add(auction)
+        auction_session.flush()
+        teams = [
+            Team(team_name=name, team_code=name[:3].upper(), auction_id=auction.id,
+                 owner_id=owner.id, purse_remaining=100.0)
+            for name in ("Alpha", "Bravo")
+        ]
+        player = AuctionPlayer(
+            auction_id=auction.id, custom_name="Test Player", base_price=1.0,
+            status_code=AuctionPlayerStatus.CURRENT
+        )
+        auction_session.add_all([*teams, player])
+        auction_session.flush()
+        auction.current_player_id = player.id
+        auction_session.commit()
+        return {
+            "auction_id": auction.id,
+            "team_ids": [team.id for team in teams],
+            "player_id": player.id,
+        }
+    
+    return make
+
+
 @pytest.fixture
 def player_matcher():
     """Create a PlayerMatcher with mock data."""
@@ -0,0 +1,154 @@
+"""
+Unit tests for AuctionManager.place_bid.
+Covers the compare-and-set UPDATE and the rollback when it does not apply.
+"""
+import pytest
+from sqlalchemy import text
+
+from auction.manager import AuctionManager
+from models import AuctionBid, AuctionEvent, TeamPlayer
+
+
+class TestPlaceBid:
+    """Tests for placing bids against a SQLite session."""
+    
+    def test_bid_is_recorded(self, auction_session, make_live_auction):
+        """An accepted bid updates the auction and points current_bid_id at its row."""
+        ids = make_live_auction()
+        team_id = ids["team_ids"][0]
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        result = manager.place_bid(team_id, 1.0)
+        
+        assert result["amount"] == 1.0
+        assert result["team_id"] == team_id
+        assert result["next_minimum"] == 1.1
+        
+        auction = auction_session.get(AuctionEvent, ids["auction_id"])
+        bid = auction_session.query(AuctionBid).one()
+        assert auction.current_bid == 1.0
+        assert auction.current_bid_team_id == team_id
+        assert auction.current_bid_id == bid.id
+        assert bid.team_id == team_id
+        assert bid.auction_player_id == ids["player_id"]
+        assert bid.bid_amount == 1.0
+    
+    def test_stale_expected_state_loses(self, auction_session, make_live_auction, monkeypatch):
+        """A bid validated against a state that changed before the UPDATE is rejected."""
+        ids = make_live_auction()
+        other_team_id = ids["team_ids"][1]
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        check_bid = manager._check_bid
+        
+        def check_then_race(auction, team_id, amount):
+            checked = check_bid(auction, team_id, amount)
+            # Another worker's bid lands between the check and the compare-and-set
+            auction_session.execute(
+                text("UPDATE auction_events SET current_bid = 1.5, current_bid_team_id = :team_id"),
+                {"team_id": other_team_id}
+            )
+            return checked
+        
+        monkeypatch.setattr(manager, "_check_bid", check_then_race)
+        
+        with pytest.raises(ValueError, match="Another bid was placed first"):
+            manager.place_bid(ids["team_ids"][0], 1.0)
+    
+    def test_insufficient_purse_rechecked_in_update(self, auction_session, make_live_auction):
+        """A purse spent elsewhere fails the exists() re-check even if the cache says enough."""
+        ids = make_live_auction()
+        team_id = ids["team_ids"][0]
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        # The manager's cached purse still says 100
+        auction_session.execute(
+            text("UPDATE teams SET purse_remaining = 0.5 WHERE id = :team_id"), {"team_id": team_id}
+        )
+        auction_session.commit()
+        
+        with pytest.raises(ValueError, match="Insufficient purse"):
+            manager.place_bid(team_id, 1.0)
+    
+    def test_rejected_bid_row_is_rolled_back(self, auction_session, make_live_auction):
+        """The AuctionBid inserted before a failed compare-and-set is discarded."""
+        ids = make_live_auction()
+        team_id = ids["team_ids"][0]
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        auction_session.execute(
+            text("UPDATE teams SET purse_remaining = 0.5 WHERE id = :team_id"), {"team_id": team_id}
+        )
+        auction_session.commit()
+        
+        with pytest.raises(ValueError):
+            manager.place_bid(team_id, 1.0)
+        
+        assert auction_session.query(AuctionBid).count() == 0
+        auction = auction_session.get(AuctionEvent, ids["auction_id"])
+        assert auction.current_bid is None
+        assert auction.current_bid_id is None
+
+    
+    @pytest.mark.parametrize("team_index, amount, error", [
+        (0, 0.5, "Bid must be at least"),
+        (0, 500.0, "Insufficient purse"),
+        (None, 1.0, "Team not found"),
+    ])
+    def test_rejected_bid_ends_transaction(self, auction_session, make_live_auction,
+                                           team_index, amount, error):
+        """A bid failing validation does not leave the session inside a transaction."""
+        ids = make_live_auction()
+        team_id = ids["team_ids"][team_index] if team_index is not None else 999
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        with pytest.raises(ValueError, match=error):
+            manager.place_bid(team_id, amount)
+        
+        assert not auction_session.in_transaction()
+
+
+class TestAuctioneerActions:
+    """Tests for presenting and closing players."""
+    
+    def test_present_unknown_player_ends_transaction(self, auction_session, make_live_auction):
+        """A rejected present does not leave the session inside a transaction."""
+        ids = make_live_auction()
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        with pytest.raises(ValueError, match="Player not found"):
+            manager.present_player(999)
+        
+        assert not auction_session.in_transaction()
+    
+    def test_sell_without_bids_ends_transaction(self, auction_session, make_live_auction):
+        """A rejected sale does not leave the session inside a transaction."""
+        ids = make_live_auction()
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        
+        with pytest.raises(ValueError, match="No bids placed"):
+            manager.sell_player()
+        
+        assert not auction_session.in_transaction()
+
+
+class TestGetState:
+    """Tests for the broadcast state."""
+    
+    def test_player_counts_per_auction(self, auction_session, make_live_auction):
+        """Each team counts only its own active players, whatever other auctions hold."""
+        ids = make_live_auction()
+        other_ids = make_live_auction()
+        auction_session.add_all([
+            TeamPlayer(team_id=ids["team_ids"][0], custom_player_name="Active"),
+            TeamPlayer(team_id=ids["team_ids"][0], custom_player_name="Released", left_at_match=3),
+            TeamPlayer(team_id=other_ids["team_ids"][0], custom_player_name="Elsewhere"),
+            TeamPlayer(team_id=other_ids["team_ids"][1], custom_player_name="Elsewhere too"),
+        ])
+        auction_session.commit()
+        
+        state = AuctionManager(ids["auction_id"], auction_session).get_state()
+        
+        assert [(team.id, team.players_count) for team in state.teams] == [
+            (ids["team_ids"][0], 1),
+            (ids["team_ids"][1], 0),
+        ]
@@ -1,28 +1,51 @@
 """
 Unit tests for auction bid increment logic.
 """
+import json
 import pytest
 import sys
 from pathlib import Path
-from decimal import Decimal
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-# Import the tier class directly (avoiding __init__.py relative imports)
-# We'll define the test data here to avoid import issues
-class BidIncrementTier:
-    def __init__(self, min_bid: float, max_bid: float, increment: float):
-        self.min_bid = Decimal(str(min_bid))
-        self.max_bid = Decimal(str(max_bid))
-        self.increment = Decimal(str(increment))
+from auction.manager import AuctionManager, DEFAULT_TIERS, _TIER_CACHE, to_cents
 
-DEFAULT_TIERS = [
-    BidIncrementTier(0, 1, 0.05),
-    BidIncrementTier(1, 2, 0.10),
-    BidIncrementTier(2, 5, 0.20),
-    BidIncrementTier(5, float('inf'), 0.25)
-]
+
+@pytest.fixture
+def manager(auction_session, make_live_auction):
+    """AuctionManager for a live auction on the default tiers."""
+    ids = make_live_auction()
+    return AuctionManager(ids["auction_id"], auction_session)
+
+
+@pytest.fixture(autouse=True)
+def clear_tier_cache():
+    """Each test's in-memory database reuses auction ids, so start uncached."""
+    _TIER_CACHE.clear()
+    yield
+    _TIER_CACHE.clear()
+
+
+class TestToCents:
+    """Tests for converting crore amounts to integer hundredths."""
+    
+    def test_whole_and_fractional_amounts(self):
+        """Test exact conversion of typical amounts."""
+        assert to_cents(0) == 0
+        assert to_cents(0.05) == 5
+        assert to_cents(1.0) == 100
+        assert to_cents(4.8) == 480
+    
+    def test_rounds_float_error(self):
+        """Test amounts that are not exact in binary round to the nearest hundredth."""
+        assert to_cents(0.1 + 0.2) == 30
+        assert to_cents(1.15) == 115
+        assert to_cents(0.95) == 95
+    
+    def test_infinity(self):
+        """Test an open-ended tier bound maps above every real bid."""
+        assert to_cents(float('inf')) == sys.maxsize
 
 
 class TestBidIncrementTiers:
@@ -35,112 +58,135 @@ class TestBidIncrementTiers:
     def test_tier_0_to_1_crore(self):
         """Test 0-1 Cr increment is 0.05."""
         tier = DEFAULT_TIERS[0]
-        assert tier.min_bid == Decimal("0")
-        assert tier.max_bid == Decimal("1")
-        assert tier.increment == Decimal("0.05")
+        assert tier.min_cents == 0
+        assert tier.max_cents == 100
+        assert tier.increment_cents == 5
     
     def test_tier_1_to_2_crore(self):
         """Test 1-2 Cr increment is 0.10."""
         tier = DEFAULT_TIERS[1]
-        assert tier.min_bid == Decimal("1")
-        assert tier.max_bid == Decimal("2")
-        assert tier.increment == Decimal("0.10")
+        assert tier.min_cents == 100
+        assert tier.max_cents == 200
+        assert tier.increment_cents == 10
     
     def test_tier_2_to_5_crore(self):
         """Test 2-5 Cr increment is 0.20."""
         tier = DEFAULT_TIERS[2]
-        assert tier.min_bid == Decimal("2")
-        assert tier.max_bid == Decimal("5")
-        assert tier.increment == Decimal("0.20")
+        assert tier.min_cents == 200
+        assert tier.max_cents == 500
+        assert tier.increment_cents == 20
     
     def test_tier_above_5_crore(self):
-        """Test 5+ Cr increment is 0.25."""
+        """Test 5+ Cr increment is 0.25 with no upper bound."""
         tier = DEFAULT_TIERS[3]
-        assert tier.min_bid == Decimal("5")
-        assert tier.increment == Decimal("0.25")
+        assert tier.min_cents == 500
+        assert tier.max_cents == sys.maxsize
+        assert tier.increment_cents == 25
 
 
 class TestGetIncrementForBid:
     """Tests for getting the correct increment based on current bid."""
     
-    def get_increment(self, bid: float) -> float:
-        """Helper to get increment for a bid amount."""
-        bid_decimal = Decimal(str(bid))
-        for tier in DEFAULT_TIERS:
-            if tier.min_bid <= bid_decimal < tier.max_bid:
-                return float(tier.increment)
-        return float(DEFAULT_TIERS[-1].increment)
-    
-    def test_increment_at_0(self):
-        """Test increment at 0 Cr."""
-        assert self.get_increment(0) == 0.05
-    
-    def test_increment_at_0_5(self):
-        """Test increment at 0.5 Cr."""
-        assert self.get_increment(0.5) == 0.05
-    
-    def test_increment_at_1(self):
-        """Test increment at exactly 1 Cr."""
-        assert self.get_increment(1.0) == 0.10
-    
-    def test_increment_at_1_5(self):
-        """Test increment at 1.5 Cr."""
-        assert self.get_increment(1.5) == 0.10
-    
-    def test_increment_at_2(self):
-        """Test increment at exactly 2 Cr."""
-        assert self.get_increment(2.0) == 0.20
-    
-    def test_increment_at_3(self):
-        """Test increment at 3 Cr."""
-        assert self.get_increment(3.0) == 0.20
-    
-    def test_increment_at_5(self):
-        """Test increment at exactly 5 Cr."""
-        assert self.get_increment(5.0) == 0.25
-    
-    def test_increment_at_10(self):
-        """Test increment at 10 Cr (high value)."""
-        assert self.get_increment(10.0) == 0.25
-    
-    def test_increment_at_20(self):
-        """Test increment at 20 Cr (very high value)."""
-        assert self.get_increment(20.0) == 0.25
+    @pytest.mark.parametrize("bid, increment", [
+        (0, 0.05),
+        (0.5, 0.05),
+        (0.95, 0.05),
+        (1.0, 0.10),
+        (1.5, 0.10),
+        (1.9, 0.10),
+        (2.0, 0.20),
+        (3.0, 0.20),
+        (4.8, 0.20),
+        (5.0, 0.25),
+        (10.0, 0.25),
+        (20.0, 0.25),
+    ])
+    def test_increment_for_bid(self, manager, bid, increment):
+        """Test the increment at and around each tier boundary."""
+        assert manager.get_increment_for_bid(bid) == increment
+    
+    def test_increment_cents_at_boundaries(self, manager):
+        """Test the lower bound of a tier belongs to that tier."""
+        assert manager._increment_cents(99) == 5
+        assert manager._increment_cents(100) == 10
+        assert manager._increment_cents(199) == 10
+        assert manager._increment_cents(200) == 20
+        assert manager._increment_cents(499) == 20
+        assert manager._increment_cents(500) == 25
+    
+    def test_increment_above_infinite_tier(self, manager):
+        """Test very high bids stay in the open-ended last tier."""
+        assert manager._increment_cents(10 ** 9) == 25
 
 
 class TestMinimumBidCalculation:
     """Tests for minimum bid calculation."""
     
-    def calculate_min_bid(self, base_price: float, current_bid: float = None) -> float:
-        """Calculate minimum valid bid."""
-        if current_bid is None:
-            return base_price
-        
-        bid_decimal = Decimal(str(current_bid))
-        for tier in DEFAULT_TIERS:
-            if tier.min_bid <= bid_decimal < tier.max_bid:
-                increment = tier.increment
-                break
-        else:
-            increment = DEFAULT_TIERS[-1].increment
-        
-        return float(bid_decimal + increment)
-    
-    def test_first_bid_equals_base_price(self):
+    def test_first_bid_equals_base_price(self, manager):
         """Test first bid should equal base price."""
-        assert self.calculate_min_bid(1.0, None) == 1.0
+        assert manager.get_minimum_bid(1.0, None) == 1.0
     
-    def test_second_bid_adds_increment(self):
+    def test_second_bid_adds_increment(self, manager):
         """Test second bid adds increment."""
         # Current bid is 1.0 (in tier 1-2), increment is 0.10
-        assert self.calculate_min_bid(1.0, 1.0) == 1.10
+        assert manager.get_minimum_bid(1.0, 1.0) == 1.10
     
-    def test_bid_at_tier_boundary(self):
+    def test_bid_at_tier_boundary(self, manager):
         """Test bid calculation at tier boundary."""
         # Current bid is 0.95 (in tier 0-1), next bid should use 0.05 increment
-        assert self.calculate_min_bid(0.2, 0.95) == 1.0
-    
-    def test_high_value_bid(self):
+        assert manager.get_minimum_bid(0.2, 0.95) == 1.0
+    
+    @pytest.mark.parametrize("current_bid, minimum", [
+        (1.9, 2.0),
+        (2.0, 2.2),
+        (4.8, 5.0),
+        (5.0, 5.25),
+    ])
+    def test_bid_around_tier_boundaries(self, manager, current_bid, minimum):
+        """Test the next minimum is exact across tier boundaries."""
+        assert manager.get_minimum_bid(0.2, current_bid) == minimum
+    
+    def test_high_value_bid(self, manager):
         """Test high value bid calculation."""
         # Current bid is 10.0 (in tier 5+), increment is 0.25
-        assert self.calculate_min_bid(1.0, 10.0) == 10.25
+        assert manager.get_minimum_bid(1.0, 10.0) == 10.25
+
+
+class TestCustomTiers:
+    """Tests for per-auction tiers configured as JSON."""
+    
+    CUSTOM_TIERS = json.dumps([
+        {"min": 3, "max": float('inf'), "increment": 0.5},
+        {"min": 0, "max": 1, "increment": 0.1},
+        {"min": 1, "max": 3, "increment": 0.25},
+    ])
+    
+    def test_tiers_sorted_by_lower_bound(self):
+        """Test tiers given out of order are sorted for the binary search."""
+        tiers, tier_mins = AuctionManager._get_tiers(1, self.CUSTOM_TIERS)
+        assert tier_mins == [0, 100, 300]
+        assert [t.increment_cents for t in tiers] == [10, 25, 50]
+        assert tiers[-1].max_cents == sys.maxsize
+    
+    def test_manager_uses_custom_tiers(self, auction_session, make_live_auction):
+        """Test increments follow the auction's configured tiers."""
+        ids = make_live_auction(bid_increment_tiers=self.CUSTOM_TIERS)
+        manager = AuctionManager(ids["auction_id"], auction_session)
+        assert manager.get_minimum_bid(0.2, 0.9) == 1.0
+        assert manager.get_minimum_bid(0.2, 1.0) == 1.25
+        assert manager.get_minimum_bid(0.2, 2.9) == 3.15
+        assert manager.get_minimum_bid(0.2, 3.0) == 3.5
+        assert manager.get_minimum_bid(0.2, 100.0) == 100.5
+    
+    @pytest.mark.parametrize("tiers_json", [
+        "not json",
+        json.dumps([{"min": 0, "max": 1}]),
+        json.dumps(5),
+        json.dumps([{"min": "0", "max": 1, "increment": 0.1}]),
+        json.dumps([{"min": 0, "max": 1, "increment": float('nan')}]),
+    ])
+    def test_invalid_tiers_fall_back_to_default(self, tiers_json):
+        """Test malformed tier JSON falls back to the default tiers."""
+        tiers, tier_mins = AuctionManager._get_tiers(1, tiers_json)
+        assert tier_mins == [0, 100, 200, 500]
+        assert [t.increment_cents for t in tiers] == [5, 10, 20, 25]
@@ -172,3 +172,71 @@ class TestFieldingPoints:
         }
         points = fantasy_calculator.calculate_fielding_points(fielder)
         assert points > 0
+
+
+class TestBatchPoints:
+    """Tests for the vectorized calculate_all path."""
+    
+    def test_matches_row_by_row(self, fantasy_calculator, sample_batsman, sample_bowler, sample_dismissal_lbw):
+        """calculate_all gives the same points and bowler bonuses as calculate_total_points."""
+        import pandas as pd
+        from calculate_points import FantasyPointsCalculator
+        
+        players = [
+            {**sample_batsman, 'batting_innings': 1, 'strike_rate': 166.67},
+            {**sample_bowler, 'bowling_innings': 1, 'catches': 3},
+            {**sample_dismissal_lbw, 'batting_innings': 1, 'strike_rate': 125.0},
+            {'player_name': 'Substitute', 'catches': 1},
+        ]
+        expected = [fantasy_calculator.calculate_total_points(p) for p in players]
+        
+        batch_calculator = FantasyPointsCalculator()
+        result = batch_calculator.calculate_all(pd.DataFrame(players))
+        
+        for row, exp in zip(result.to_dict('records'), expected):
+            for key in ('total_points', 'batting_points', 'bowling_points', 'fielding_points'):
+                assert row[key] == exp[key]
+        assert batch_calculator.bowlers_bonus == fantasy_calculator.bowlers_bonus
+    
+    def test_players_match_row_by_row(self, fantasy_calculator, sample_batsman, sample_bowler):
+        """calculate_players returns the calculate_total_points dicts, in order."""
+        from calculate_points import FantasyPointsCalculator
+        
+        players = [
+            {**sample_batsman, 'team': 'T1', 'match_id': 'm1', 'batting_innings': 1, 'strike_rate': 166.67},
+            {**sample_bowler, 'team': 'T2', 'match_id': 'm1', 'bowling_innings': 1},
+            {'player_name': 'Substitute', 'team': 'T2', 'match_id': 'm1', 'catches': 1},
+        ]
+        expected = [fantasy_calculator.calculate_total_points(p) for p in players]
+        
+        assert FantasyPointsCalculator().calculate_players(players) == expected
+    
+    def test_players_empty(self):
+        """A match with no players scores to an empty list."""
+        from calculate_points import FantasyPointsCalculator
+        
+        assert FantasyPointsCalculator().calculate_players([]) == []
+
+
+class TestPointsFiles:
+    """Tests for reading stats and writing points CSV files."""
+    
+    def test_points_round_trip(self, tmp_path, fantasy_calculator, sample_batsman, sample_bowler):
+        """Points written by save_output_file read back unchanged, in order."""
+        from calculate_points import OUTPUT_FIELDNAMES, process_input_file, save_output_file
+        
+        players_points = [
+            fantasy_calculator.calculate_total_points({**sample_batsman, 'match_id': 'm1', 'batting_innings': 1}),
+            fantasy_calculator.calculate_total_points({**sample_bowler, 'match_id': 'm1', 'bowling_innings': 1}),
+            {'player_name': 'Name, with comma', 'team': 'T', 'match_id': 'm2', 'total_points': 0},
+        ]
+        output_file = tmp_path / "points.csv"
+        save_output_file(players_points, output_file)
+        
+        rows = process_input_file(output_file)
+        
+        assert list(rows[0].keys()) == list(OUTPUT_FIELDNAMES)
+        assert rows == [
+            {field: str(points.get(field, '')) for field in OUTPUT_FIELDNAMES}
+            for points in players_points
+        ]